@@ -15,6 +15,18 @@ import os
 from datetime import datetime
 from pathlib import Path
 
+# How long --stop waits for a running job to finish before force-killing
+STOP_TIMEOUT_SECONDS = int(os.getenv("SCHEDULER_STOP_TIMEOUT", "600"))
+STOP_POLL_SECONDS = 1
+
+def _process_running(pid: int) -> bool:
+    """Check whether a process with this PID still exists"""
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+
 def run_in_background():
     """Run the scheduler as a background process with nohup"""
     cmd = ["nohup", "python", "-m", "src.core.scheduler"]
@@ -59,26 +71,22 @@ def stop_background():
         
         print(f"🛑 Stopping scheduler (PID: {pid})...")
         
-        # Try graceful shutdown first
+        # Graceful shutdown: the scheduler lets a running job finish first
         os.kill(pid, signal.SIGTERM)
-        time.sleep(2)
         
-        # Check if still running
-        try:
-            os.kill(pid, 0)  # Just check if process exists
-            print("⏰ Waiting for graceful shutdown...")
-            time.sleep(3)
-            
-            # Force kill if still running
+        deadline = time.monotonic() + STOP_TIMEOUT_SECONDS
+        if _process_running(pid):
+            print(f"⏰ Waiting up to {STOP_TIMEOUT_SECONDS}s for the current job to finish...")
+        while _process_running(pid) and time.monotonic() < deadline:
+            time.sleep(STOP_POLL_SECONDS)
+        
+        # Force kill if still running
+        if _process_running(pid):
             try:
-                os.kill(pid, 0)
                 os.kill(pid, signal.SIGKILL)
                 print("💀 Force killed scheduler")
             except ProcessLookupError:
-                pass  # Process already terminated
-                
-        except ProcessLookupError:
-            pass  # Process already terminated
+                pass  # Process terminated just now
         
         # Remove PID file
         pid_file.unlink()
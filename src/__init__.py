@@ -5,18 +5,34 @@ A comprehensive system for monitoring NSE RSS feeds, detecting awards/contracts,
 and sending automated email alerts with AI-generated summaries.
 """
 
+import importlib
+
 __version__ = "2.0.0"
 __author__ = "RSS Awards System"
 
-# Make key components easily importable
-try:
-    from src.core.processor import process_rss_awards, get_email_config_from_env
-    from src.core.scheduler import RSSScheduler
-    from src.communication.email_sender import EmailSender
-    from src.data.rss_fetcher import RSSFetcher
-except ImportError:
-    # Handle relative imports when package is imported
-    pass
+# Make key components easily importable. They are loaded on first access
+# (PEP 562) so importing any submodule doesn't drag in the whole stack.
+_LAZY_IMPORTS = {
+    'process_rss_awards': 'src.core.processor',
+    'get_email_config_from_env': 'src.core.processor',
+    'RSSScheduler': 'src.core.scheduler',
+    'EmailSender': 'src.communication.email_sender',
+    'RSSFetcher': 'src.data.rss_fetcher',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # Later lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
 
 __all__ = [
     'process_rss_awards',
@@ -8,10 +8,8 @@ import os
 import json
 import argparse
 from typing import Dict, List, Optional
-from google import genai
-from google.genai import types
-from google.genai.types import Tool, GenerateContentConfig, GoogleSearch
 from datetime import datetime
+from src.ai.gemini_client import get_gemini_client
 
 # Load environment variables from .env file
 try:
@@ -28,8 +26,8 @@ class FinancialDataTool:
         if not self.api_key:
             raise ValueError("Gemini API key not found. Set GEMINI_API_KEY environment variable.")
         
-        # Initialize client
-        self.client = genai.Client(api_key=self.api_key)
+        # Shared client, so lookups reuse the same connections as summaries
+        self.client = get_gemini_client(self.api_key)
     
     def get_company_financial_data(self, company_name: str, exchange: str = "NSE") -> Dict:
         """
@@ -42,6 +40,10 @@ class FinancialDataTool:
         Returns:
             Dictionary containing financial data
         """
+        # Imported here: google.genai is slow to import and only needed once a lookup runs
+        from google.genai import types
+        from google.genai.types import Tool, GoogleSearch
+        
         try:
             print(f"🔍 Searching for verified financial data for {company_name}...")
             
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Shared Gemini Client - One google-genai client for the whole process
+
+Summaries, batch summaries, financial lookups and the email helpers all talk
+to the same Gemini API. Sharing one client keeps its HTTP connections alive
+across calls instead of opening a new pool per call site, and google.genai
+(slow to import) is only loaded once a client is first requested. Every call
+site also holds gemini_semaphore while a request is in flight, so the quota
+cap applies to the process as a whole, and retries transient failures
+through retry().
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    from google import genai
+
+# Cap on concurrent Gemini calls across the whole process, to respect quota
+MAX_CONCURRENT_GEMINI_CALLS = 4
+gemini_semaphore = threading.Semaphore(MAX_CONCURRENT_GEMINI_CALLS)
+
+logger = logging.getLogger(__name__)
+
+_clients: Dict[str, "genai.Client"] = {}
+_clients_lock = threading.Lock()
+
+
+def get_gemini_client(api_key: Optional[str] = None) -> "genai.Client":
+    """
+    Get the shared Gemini client, creating it on first use.
+
+    Args:
+        api_key: API key to use, defaults to the GEMINI_API_KEY environment variable
+
+    Returns:
+        The client for that key, shared by every caller in the process
+
+    Raises:
+        ValueError: If no API key is given or set in the environment
+    """
+    api_key = api_key or os.getenv('GEMINI_API_KEY')
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY environment variable not found")
+
+    client = _clients.get(api_key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(api_key)
+            if client is None:
+                from google import genai
+                client = _clients[api_key] = genai.Client(api_key=api_key)
+    return client
+
+
+# Failures that retrying can't fix (bad or missing credentials)
+_NON_RETRYABLE_ERRORS = (
+    'invalid_api_key',
+    'api_key_invalid',
+    'api key not valid',
+    'permission_denied',
+    'gemini_api_key environment variable not found',
+)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Check whether an error is worth retrying"""
+    message = str(error).lower()
+    return not any(marker in message for marker in _NON_RETRYABLE_ERRORS)
+
+
+def retry(fn, attempts: int = 2, base: float = 0.5, description: str = "call"):
+    """
+    Call fn, retrying failures with exponential backoff and jitter.
+
+    Non-retryable errors and the last attempt's error are raised immediately.
+
+    Args:
+        fn: Zero-argument callable to run
+        attempts: Total number of attempts
+        base: Delay before the first retry in seconds, doubled for each retry
+        description: What is being attempted, for log messages
+        
+    Returns:
+        Whatever fn returns
+    """
+    for attempt in range(attempts):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == attempts - 1 or not is_retryable(e):
+                raise
+            delay = base * 2 ** attempt + random.uniform(0, 0.25)
+            logger.warning("⚠️ Attempt %d of %s failed: %s, retrying in %.2fs...", attempt + 1, description, e, delay)
+            time.sleep(delay)
@@ -4,63 +4,213 @@ PDF Summarizer using Gemini API
 Sends PDF text to Gemini for summarization without tools or grounding.
 """
 
-import os
 import sys
-from google import genai
-from google.genai import types
+import json
+import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, List, Optional
+from src.ai.gemini_client import gemini_semaphore, get_gemini_client, retry
 from src.ai.pdf_text_extractor import pdf_url_to_text
+from src.data.cache_manager import content_key, get_cache
 
+if TYPE_CHECKING:
+    from google.genai import types
 
-def summarize_text_with_gemini(text: str) -> str:
+logger = logging.getLogger(__name__)
+
+MODEL_ID = "models/gemini-2.5-flash-preview-05-20"
+
+# Batched summarization: total prompt size per Gemini call
+MAX_BATCH_CHARS = 800000
+
+# A one-line summary only needs the headline pages of a filing
+SUMMARY_MAX_PAGES = 2
+SUMMARY_MAX_CHARS = 4000
+
+# Default instructions and answer size: a one-line description of a filing
+SUMMARY_INSTRUCTIONS = (
+    "Give me a short, one line description of this report. "
+    "If the company accepted a new order, mention it specifically."
+)
+SUMMARY_OUTPUT_TOKENS = 128
+
+NO_RESPONSE = "No response received from Gemini"
+
+
+@functools.lru_cache(maxsize=None)
+def _prompt_header(instructions: str) -> str:
+    """Prompt part sent ahead of the document text, so the text is never copied into a prompt string"""
+    return f"{instructions}\n\nText content:\n"
+
+
+@functools.lru_cache(maxsize=None)
+def _summary_config(max_output_tokens: int) -> "types.GenerateContentConfig":
+    """Shared generation config for single-document summaries, built on first use per answer size"""
+    from google.genai import types
+    return types.GenerateContentConfig(
+        response_modalities=["TEXT"],
+        temperature=0.1,
+        top_p=0.8,
+        top_k=40,
+        max_output_tokens=max_output_tokens,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _batch_config(count: int, max_output_tokens: int) -> "types.GenerateContentConfig":
+    """Shared generation config for a JSON batch of count summaries"""
+    from google.genai import types
+    return types.GenerateContentConfig(
+        response_modalities=["TEXT"],
+        response_mime_type="application/json",
+        temperature=0.1,
+        top_p=0.8,
+        top_k=40,
+        max_output_tokens=max_output_tokens * count,
+    )
+
+
+def _summary_cache_key(text: str, instructions: str) -> str:
+    """Cache key for the summary of a text under the given instructions"""
+    return content_key(MODEL_ID, instructions, text)
+
+
+def summarize_text_with_gemini(text: str, instructions: str = SUMMARY_INSTRUCTIONS,
+                               max_output_tokens: int = SUMMARY_OUTPUT_TOKENS) -> str:
     """
     Send text to Gemini for summarization.
     
     Args:
         text (str): The text content to summarize
+        instructions (str): What to write about the text
+        max_output_tokens (int): Longest answer Gemini may give
         
     Returns:
         str: Gemini's summary response
     """
-    # Get API key
-    api_key = os.getenv('GEMINI_API_KEY')
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY environment variable not found")
-    
-    # Initialize client
-    client = genai.Client(api_key=api_key)
-    model_id = "models/gemini-2.5-flash-preview-05-20"
+    # Reuse a summary already generated for this exact prompt
+    cache = get_cache()
+    cache_key = _summary_cache_key(text, instructions)
+    cached_summary = cache.get_summary(cache_key)
+    if cached_summary is not None:
+        return cached_summary
     
-    # Create the prompt
-    prompt = f"""Give me a short, one line description of this report. If the company accepted a new order, mention it specifically.
-
-Text content:
-{text}"""
+    client = get_gemini_client()
     
     try:
         # Generate response without any tools
-        response = client.models.generate_content(
-            model=model_id,
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                response_modalities=["TEXT"],
-                temperature=0.1,
-                top_p=0.8,
-                top_k=40,
-                max_output_tokens=1024,
+        with gemini_semaphore:
+            response = client.models.generate_content(
+                model=MODEL_ID,
+                contents=[_prompt_header(instructions), text],
+                config=_summary_config(max_output_tokens)
             )
-        )
         
         # Extract and return the text response
         for part in response.candidates[0].content.parts:
             if part.text:
-                return part.text.strip()
+                summary = part.text.strip()
+                cache.set_summary(cache_key, summary)
+                return summary
         
-        return "No response received from Gemini"
+        return NO_RESPONSE
         
     except Exception as e:
         raise Exception(f"Error getting Gemini response: {e}")
 
 
+def _summarize_batch_with_gemini(texts: List[str], instructions: str, max_output_tokens: int) -> List[str]:
+    """Send one batch of texts to Gemini and parse the JSON array of summaries"""
+    client = get_gemini_client()
+    
+    sections = [
+        f"The {len(texts)} reports below each start with a [i] line. "
+        "Apply these instructions to each report separately:\n\n",
+        instructions,
+        f"\n\nReturn a JSON array of exactly {len(texts)} strings, one answer per report, in the same order.\n"
+    ]
+    for i, text in enumerate(texts, 1):
+        sections.append(f"\n[{i}]\n{text}\n")
+    prompt = "".join(sections)
+    
+    try:
+        with gemini_semaphore:
+            response = client.models.generate_content(
+                model=MODEL_ID,
+                contents=prompt,
+                config=_batch_config(len(texts), max_output_tokens)
+            )
+        
+        summaries = json.loads(response.text)
+        
+    except Exception as e:
+        raise Exception(f"Error getting Gemini batch response: {e}")
+    
+    if not isinstance(summaries, list) or len(summaries) != len(texts):
+        raise Exception(f"Gemini batch response did not contain {len(texts)} summaries")
+    
+    return [str(summary).strip() for summary in summaries]
+
+
+def summarize_texts_with_gemini(texts: List[str], instructions: str = SUMMARY_INSTRUCTIONS,
+                                max_output_tokens: int = SUMMARY_OUTPUT_TOKENS) -> List[Optional[str]]:
+    """
+    Summarize several texts with as few Gemini calls as possible.
+    
+    Cached summaries are reused; the remaining texts are packed into prompts of
+    up to MAX_BATCH_CHARS characters, each answered with a JSON array. A batch
+    that fails or comes back malformed falls back to one call per text, retried
+    with backoff, and a text whose own call still fails is left as None without
+    affecting the others.
+    
+    Args:
+        texts (List[str]): The text contents to summarize
+        instructions (str): What to write about each text
+        max_output_tokens (int): Longest answer Gemini may give per text
+        
+    Returns:
+        List[Optional[str]]: Summaries in the same order as texts, None where summarization failed
+    """
+    cache = get_cache()
+    cache_keys = [_summary_cache_key(text, instructions) for text in texts]
+    summaries: List[Optional[str]] = [cache.get_summary(key) for key in cache_keys]
+    
+    # Pack uncached texts into batches bounded by prompt size
+    batches: List[List[int]] = []
+    batch_chars = 0
+    for i, summary in enumerate(summaries):
+        if summary is not None:
+            continue
+        if not batches or batch_chars + len(texts[i]) > MAX_BATCH_CHARS:
+            batches.append([])
+            batch_chars = 0
+        batches[-1].append(i)
+        batch_chars += len(texts[i])
+    
+    for batch in batches:
+        if len(batch) > 1:
+            try:
+                batch_summaries = _summarize_batch_with_gemini([texts[i] for i in batch], instructions, max_output_tokens)
+                for i, summary in zip(batch, batch_summaries):
+                    summaries[i] = summary
+                    cache.set_summary(cache_keys[i], summary)
+                continue
+            except Exception as e:
+                logger.warning("Batch summarization failed, falling back to one call per text: %s", e)
+        
+        for i in batch:
+            try:
+                summaries[i] = retry(
+                    lambda: summarize_text_with_gemini(texts[i], instructions, max_output_tokens),
+                    description=f"Gemini summary of text {i + 1}"
+                )
+            except Exception as e:
+                logger.warning("Failed to summarize text %d: %s", i + 1, e)
+    
+    return summaries
+
+
 def summarize_pdf_from_url(url: str) -> str:
     """
     Download PDF from URL, extract text, and summarize with Gemini.
@@ -71,43 +221,84 @@ def summarize_pdf_from_url(url: str) -> str:
     Returns:
         str: Gemini's summary of the PDF content
     """
-    print(f"Processing PDF from: {url}")
+    logger.debug("Processing PDF from: %s", url)
     
-    # Extract text from PDF
-    text = pdf_url_to_text(url)
+    # Extract text from the leading pages of the PDF
+    text = pdf_url_to_text(url, max_pages=SUMMARY_MAX_PAGES)
     if not text:
         raise Exception("Failed to extract text from PDF")
     
-    print(f"Extracted {len(text)} characters from PDF")
-    print("Sending to Gemini for summarization...")
+    logger.debug("Extracted %d characters from PDF", len(text))
+    text = text[:SUMMARY_MAX_CHARS]
+    logger.debug("Sending to Gemini for summarization...")
     
     # Summarize with Gemini
     summary = summarize_text_with_gemini(text)
     return summary
 
 
+def summarize_many(urls: List[str], max_workers: int = 8) -> List[Optional[str]]:
+    """
+    Summarize several PDFs with concurrent downloads and batched Gemini calls.
+    
+    Each PDF is downloaded and extracted in a thread pool so the network waits
+    overlap, then all extracted texts are summarized together via
+    summarize_texts_with_gemini.
+    
+    Args:
+        urls (List[str]): The URLs of the PDF files
+        max_workers (int): Maximum number of PDFs downloaded at once
+        
+    Returns:
+        List[Optional[str]]: Summaries in the same order as urls, None where a PDF failed
+    """
+    if not urls:
+        return []
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+        texts = list(executor.map(lambda url: pdf_url_to_text(url, max_pages=SUMMARY_MAX_PAGES), urls))
+    
+    summaries: List[Optional[str]] = [None] * len(urls)
+    extracted = []
+    for i, text in enumerate(texts):
+        if text:
+            extracted.append(i)
+        else:
+            logger.warning("Failed to extract text from %s", urls[i])
+    
+    # Failures are per text, so one bad PDF never costs the others their summary
+    for i, summary in zip(extracted, summarize_texts_with_gemini([texts[i][:SUMMARY_MAX_CHARS] for i in extracted])):
+        summaries[i] = summary
+    
+    return summaries
+
+
 def main():
     """Main function for command line usage."""
-    if len(sys.argv) != 2:
-        print("Usage: python pdf_summarizer.py <pdf_url>")
+    if len(sys.argv) < 2:
+        print("Usage: python pdf_summarizer.py <pdf_url> [<pdf_url> ...]")
         print("Example: python pdf_summarizer.py https://example.com/document.pdf")
         print("\nMake sure GEMINI_API_KEY is set in your environment")
         sys.exit(1)
     
-    url = sys.argv[1]
+    urls = sys.argv[1:]
     
     try:
         print("=" * 60)
         print("PDF SUMMARIZER")
         print("=" * 60)
         
-        summary = summarize_pdf_from_url(url)
+        if len(urls) == 1:
+            summaries = [summarize_pdf_from_url(urls[0])]
+        else:
+            summaries = summarize_many(urls)
         
-        print("\n" + "=" * 60)
-        print("SUMMARY:")
-        print("=" * 60)
-        print(summary)
-        print("=" * 60)
+        for url, summary in zip(urls, summaries):
+            print("\n" + "=" * 60)
+            print(f"SUMMARY: {url}")
+            print("=" * 60)
+            print(summary if summary is not None else "❌ Failed to summarize PDF")
+            print("=" * 60)
         
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -6,54 +6,139 @@ Downloads a PDF from a URL and extracts text content.
 
 import requests
 import io
-from typing import Optional
+import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 import PyPDF2
 import sys
 
+from src.data.http_session import rate_limited_get
+from src.data.cache_manager import content_key, get_cache
+
+logger = logging.getLogger(__name__)
+
+# Download configuration
+DOWNLOAD_CHUNK_SIZE = 64 * 1024  # 64 KiB per streamed chunk
+MAX_PDF_BYTES = 50 * 1024 * 1024  # Refuse anything larger than 50 MB
+PDF_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# PDF signature; readers accept it anywhere in the first 1 KiB
+PDF_MAGIC = b"%PDF-"
+PDF_MAGIC_WINDOW = 1024
+
+
+def is_pdf_content(content: bytes) -> bool:
+    """Cheap check that bytes look like a PDF (e.g. not an HTML login page)"""
+    return PDF_MAGIC in content[:PDF_MAGIC_WINDOW]
+
 
 def download_pdf(url: str) -> Optional[bytes]:
     """
     Download PDF content from a URL.
     
+    Sends If-None-Match / If-Modified-Since when validators from a previous
+    download are known, and serves the stored copy on 304 Not Modified.
+    
     Args:
         url (str): The URL of the PDF file
         
     Returns:
         Optional[bytes]: PDF content as bytes, or None if download fails
     """
+    result = _download_pdf(url)
+    return result[0] if result else None
+
+
+def _download_pdf(url: str) -> Optional[Tuple[bytes, str]]:
+    """Download a PDF and return its bytes with their SHA-256, or None on failure"""
     try:
-        print(f"Downloading PDF from: {url}")
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+        logger.debug("Downloading PDF from: %s", url)
+        
+        # Revalidate against the stored copy if we have one
+        cache = get_cache()
+        headers = dict(PDF_HEADERS)
+        meta = cache.get_url_meta(url)
+        if meta and cache.has_blob(meta['sha256']):
+            if meta['etag']:
+                headers['If-None-Match'] = meta['etag']
+            if meta['last_mod']:
+                headers['If-Modified-Since'] = meta['last_mod']
+        else:
+            meta = None
+        
+        for attempt in range(2):
+            # Stream through the shared session so connections are reused across PDFs
+            with rate_limited_get(url, headers=headers, timeout=30, stream=True) as response:
+                if response.status_code == 304 and meta:
+                    cached_content = cache.get_blob(meta['sha256'])
+                    if cached_content is not None:
+                        logger.debug("PDF not modified, using stored copy (%d bytes)", len(cached_content))
+                        return cached_content, meta['sha256']
+                
+                response.raise_for_status()
+                
+                # Check if the content is actually a PDF
+                if response.headers.get('content-type', '').lower() not in ['application/pdf', 'application/octet-stream']:
+                    logger.debug("Content type is %s, expected PDF", response.headers.get('content-type'))
+                
+                buffer = io.BytesIO()
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    buffer.write(chunk)
+                    if buffer.tell() > MAX_PDF_BYTES:
+                        logger.warning("Error downloading PDF %s: exceeds %d bytes", url, MAX_PDF_BYTES)
+                        return None
+                
+                etag = response.headers.get('ETag')
+                last_mod = response.headers.get('Last-Modified')
+            
+            pdf_content = buffer.getvalue()
+            if is_pdf_content(pdf_content):
+                break
+            
+            # Servers sometimes return an HTML page; ask explicitly for the PDF once
+            if attempt == 0:
+                logger.debug("Response is not a PDF, retrying with Accept: application/pdf")
+                headers['Accept'] = 'application/pdf'
+        else:
+            logger.warning("Error downloading PDF %s: response is not a PDF", url)
+            return None
         
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
+        logger.debug("Successfully downloaded PDF (%d bytes)", len(pdf_content))
         
-        # Check if the content is actually a PDF
-        if response.headers.get('content-type', '').lower() not in ['application/pdf', 'application/octet-stream']:
-            print(f"Warning: Content type is {response.headers.get('content-type')}, expected PDF")
+        # Store every download by content hash, so a document re-posted under a
+        # new URL maps to the same blob, and remember validators for revalidation
+        sha256 = content_key(pdf_content)
+        if cache.has_blob(sha256) or cache.put_blob(sha256, pdf_content):
+            cache.set_url_meta(url, etag, last_mod, sha256)
         
-        print(f"Successfully downloaded PDF ({len(response.content)} bytes)")
-        return response.content
+        return pdf_content, sha256
         
     except requests.exceptions.RequestException as e:
-        print(f"Error downloading PDF: {e}")
+        logger.warning("Error downloading PDF %s: %s", url, e)
         return None
 
 
-def extract_text_from_pdf(pdf_content: bytes) -> Optional[str]:
+def extract_text_from_pdf(pdf_content: bytes, max_pages: Optional[int] = None) -> Optional[str]:
     """
     Extract text content from PDF bytes.
     
     Args:
         pdf_content (bytes): PDF file content as bytes
+        max_pages (Optional[int]): Only extract the first max_pages pages (all if None)
         
     Returns:
         Optional[str]: Extracted text content, or None if extraction fails
     """
+    # Skip the parser entirely for non-PDF payloads
+    if not is_pdf_content(pdf_content):
+        logger.warning("Error extracting text from PDF: content is not a PDF")
+        return None
+    
     try:
-        print("Extracting text from PDF...")
+        logger.debug("Extracting text from PDF...")
         
         # Create a file-like object from bytes
         pdf_file = io.BytesIO(pdf_content)
@@ -61,45 +146,132 @@ def extract_text_from_pdf(pdf_content: bytes) -> Optional[str]:
         # Create PDF reader object
         pdf_reader = PyPDF2.PdfReader(pdf_file)
         
-        print(f"PDF has {len(pdf_reader.pages)} pages")
+        logger.debug("PDF has %d pages", len(pdf_reader.pages))
+        
+        # Extract text from all pages (or just the leading ones)
+        page_count = len(pdf_reader.pages)
+        if max_pages is not None:
+            page_count = min(page_count, max_pages)
         
-        # Extract text from all pages
-        text_content = ""
-        for page_num, page in enumerate(pdf_reader.pages):
+        # Collect parts and join once instead of re-copying the string per page
+        parts = []
+        for page_num in range(page_count):
             try:
-                page_text = page.extract_text()
-                text_content += f"\n--- Page {page_num + 1} ---\n"
-                text_content += page_text
+                page_text = pdf_reader.pages[page_num].extract_text()
             except Exception as e:
-                print(f"Error extracting text from page {page_num + 1}: {e}")
+                logger.warning("Error extracting text from page %d: %s", page_num + 1, e)
                 continue
+            parts.append(f"\n--- Page {page_num + 1} ---\n")
+            parts.append(page_text)
+        text_content = "".join(parts)
         
-        print(f"Successfully extracted text ({len(text_content)} characters)")
+        logger.debug("Successfully extracted text (%d characters)", len(text_content))
         return text_content.strip()
         
     except Exception as e:
-        print(f"Error extracting text from PDF: {e}")
+        logger.warning("Error extracting text from PDF: %s", e)
         return None
 
 
-def pdf_url_to_text(url: str) -> Optional[str]:
+class PDFTextUnavailable(Exception):
+    """Raised when a PDF could not be downloaded or parsed"""
+
+
+def _extract_text_cached(pdf_content: bytes, sha256: str, max_pages: Optional[int]) -> Optional[str]:
+    """Extract text from PDF bytes, reusing text already extracted from identical bytes"""
+    cache = get_cache()
+    cache_key = sha256
+    if max_pages is not None:
+        cache_key = f"{cache_key}:p{max_pages}"
+    text_content = cache.get_text(cache_key)
+    if text_content is not None:
+        logger.debug("Using cached text (%d characters)", len(text_content))
+        return text_content
+    
+    # Extract text
+    text_content = extract_text_from_pdf(pdf_content, max_pages)
+    if not text_content:
+        return None
+    
+    cache.set_text(cache_key, text_content)
+    return text_content
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_pdf_url_to_text(url: str, max_pages: Optional[int]) -> str:
+    """Download and extract a PDF, memoizing successes by URL"""
+    # Download PDF
+    result = _download_pdf(url)
+    if result is None:
+        raise PDFTextUnavailable(url)
+    pdf_content, sha256 = result
+    
+    # Reuse text already extracted from identical bytes, whatever URL they came from
+    text_content = _extract_text_cached(pdf_content, sha256, max_pages)
+    if not text_content:
+        raise PDFTextUnavailable(url)
+    
+    return text_content
+
+
+def pdf_url_to_text(url: str, max_pages: Optional[int] = None) -> Optional[str]:
     """
     Download PDF from URL and extract text content.
     
+    Results are cached in memory by URL and on disk by PDF content hash, so
+    repeat documents skip the parse entirely.
+    
     Args:
         url (str): The URL of the PDF file
+        max_pages (Optional[int]): Only extract the first max_pages pages (all if None)
         
     Returns:
         Optional[str]: Extracted text content, or None if process fails
     """
-    # Download PDF
-    pdf_content = download_pdf(url)
-    if pdf_content is None:
+    try:
+        return _cached_pdf_url_to_text(url, max_pages)
+    except PDFTextUnavailable:
         return None
+
+
+def pdf_bytes_to_text(pdf_content: bytes, max_pages: Optional[int] = None) -> Optional[str]:
+    """
+    Extract text content from already-downloaded PDF bytes.
     
-    # Extract text
-    text_content = extract_text_from_pdf(pdf_content)
-    return text_content
+    Uses the same on-disk text cache as pdf_url_to_text, keyed by content hash.
+    
+    Args:
+        pdf_content (bytes): PDF file content as bytes
+        max_pages (Optional[int]): Only extract the first max_pages pages (all if None)
+        
+    Returns:
+        Optional[str]: Extracted text content, or None if extraction fails
+    """
+    return _extract_text_cached(pdf_content, content_key(pdf_content), max_pages)
+
+
+def fetch_pdfs(urls: List[str], max_workers: int = 8) -> Dict[str, bytes]:
+    """
+    Download several PDFs concurrently through the shared pooled session.
+    
+    Keeping the network stage separate from parsing lets every download
+    overlap, instead of each one waiting behind the previous document's parse.
+    
+    Args:
+        urls (List[str]): The URLs of the PDF files
+        max_workers (int): Maximum number of downloads at once
+        
+    Returns:
+        Dict[str, bytes]: PDF content by URL, for the downloads that succeeded
+    """
+    unique_urls = list(dict.fromkeys(urls))
+    if not unique_urls:
+        return {}
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_urls))) as executor:
+        results = list(executor.map(download_pdf, unique_urls))
+    
+    return {url: content for url, content in zip(unique_urls, results) if content is not None}
 
 
 def main():
@@ -25,16 +25,18 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
 from datetime import datetime
+import importlib.util
 import os
 from typing import List, Optional
 import getpass
 
-# PDF Summarization imports
+# PDF Summarization imports (google.genai itself is imported on first use)
 try:
-    from google import genai
-    from google.genai import types
+    from src.ai.gemini_client import gemini_semaphore, get_gemini_client
     from src.ai.pdf_text_extractor import pdf_url_to_text
-    PDF_SUMMARIZATION_AVAILABLE = True
+    PDF_SUMMARIZATION_AVAILABLE = importlib.util.find_spec("google.genai") is not None
+    if not PDF_SUMMARIZATION_AVAILABLE:
+        raise ImportError("google.genai not installed")
 except ImportError:
     PDF_SUMMARIZATION_AVAILABLE = False
     print("⚠️  Warning: PDF summarization requires 'google-genai' and 'pdf_text_extractor' modules")
@@ -50,13 +52,9 @@ def summarize_text_with_gemini(text: str) -> str:
     Returns:
         str: Gemini's summary response
     """
-    # Get API key
-    api_key = os.getenv('GEMINI_API_KEY')
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY environment variable not found")
-    
-    # Initialize client
-    client = genai.Client(api_key=api_key)
+    # Shared client (raises if GEMINI_API_KEY is not set)
+    from google.genai import types
+    client = get_gemini_client()
     model_id = "models/gemini-2.5-flash-preview-05-20"
     
     # Create the prompt
@@ -88,17 +86,18 @@ Document text:
     
     try:
         # Generate response without any tools
-        response = client.models.generate_content(
-            model=model_id,
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                response_modalities=["TEXT"],
-                temperature=0.1,
-                top_p=0.8,
-                top_k=40,
-                max_output_tokens=1024,
+        with gemini_semaphore:
+            response = client.models.generate_content(
+                model=model_id,
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    response_modalities=["TEXT"],
+                    temperature=0.1,
+                    top_p=0.8,
+                    top_k=40,
+                    max_output_tokens=1024,
+                )
             )
-        )
         
         # Extract and return the text response
         for part in response.candidates[0].content.parts:
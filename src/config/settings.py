@@ -4,6 +4,8 @@ from pathlib import Path
 # Database Configuration
 DATABASE_PATH = "rss_articles.db"
 DATABASE_URL = f"sqlite:///{DATABASE_PATH}"
+CACHE_DB_PATH = "cache.db"  # PDF text and Gemini summary cache
+CACHE_RETENTION_DAYS = 30  # Cached text, summaries and stored PDFs expire after this
 
 # RSS Feed Configuration
 RSS_CONFIG = {
@@ -55,6 +57,7 @@ STREAMLIT_CONFIG = {
 PROJECT_ROOT = Path(__file__).parent
 DATA_DIR = PROJECT_ROOT / "data"
 LOGS_DIR = PROJECT_ROOT / "logs"
+BLOB_DIR = DATA_DIR / "blobs"  # Downloaded PDFs keyed by content hash
 
 # Create directories if they don't exist
 DATA_DIR.mkdir(exist_ok=True)
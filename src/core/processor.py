@@ -7,9 +7,11 @@ filtering for awards/bagging articles, getting financial data, and sending email
 Designed to be called from schedulers or other automation systems.
 """
 
+import importlib.util
 import logging
-import re
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from html import escape
 from typing import List, Dict, Optional, Tuple
 import os
 from dotenv import load_dotenv
@@ -19,47 +21,54 @@ load_dotenv()
 
 # Import existing modules
 from src.data.rss_fetcher import RSSFetcher
+from src.data.database_manager import DatabaseManager
 from src.core.filter_engine import FilterEngine, PresetFilters
 from src.communication.email_sender import EmailSender
 from src.data.hash_database_manager import HashDatabaseManager
+from src.data.cache_manager import content_key, get_cache
+from src.data.http_session import get_session
+from src.data.company_names import extract_company_name
+from src.ai.gemini_client import MAX_CONCURRENT_GEMINI_CALLS, gemini_semaphore, retry
 
-# Import financial data tool (optional)
+# Import financial data tool (optional; like the summarizer below, it only
+# imports google.genai once a lookup runs, so here the package is just located)
 try:
     from src.ai.financial_data_tool import FinancialDataTool
-    FINANCIAL_DATA_AVAILABLE = True
+    FINANCIAL_DATA_AVAILABLE = importlib.util.find_spec("google.genai") is not None
 except ImportError:
     FINANCIAL_DATA_AVAILABLE = False
 
-# PDF Summarization imports
+# PDF Summarization imports (google.genai is slow to import, so it is only
+# located here and imported when a summary is first requested)
 try:
-    from google import genai
-    from google.genai import types
-    from src.ai.pdf_text_extractor import pdf_url_to_text
-    PDF_SUMMARIZATION_AVAILABLE = True
+    from src.ai import pdf_summarizer
+    from src.ai.pdf_text_extractor import fetch_pdfs, pdf_bytes_to_text
+    PDF_SUMMARIZATION_AVAILABLE = importlib.util.find_spec("google.genai") is not None
 except ImportError:
     PDF_SUMMARIZATION_AVAILABLE = False
 
-def summarize_text_with_gemini(text: str) -> str:
-    """
-    Send text to Gemini for summarization.
-    
-    Args:
-        text (str): The text content to summarize
-        
-    Returns:
-        str: Gemini's summary response
-    """
-    # Get API key
-    api_key = os.getenv('GEMINI_API_KEY')
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY environment variable not found")
-    
-    # Initialize client
-    client = genai.Client(api_key=api_key)
-    model_id = "models/gemini-2.5-flash-preview-05-20"
-    
-    # Create the prompt
-    prompt = f"""Analyze this NSE company filing about a new order. Provide a brief summary followed by key details.
+logger = logging.getLogger(__name__)
+
+# Summary prefetch concurrency: downloads overlap freely, Gemini calls are
+# capped process-wide by the shared gemini_semaphore
+SUMMARY_MAX_WORKERS = 4
+
+# Only re-check articles the feed has shown within this window (runs are every 15 minutes)
+RECENT_ARTICLES_WINDOW = timedelta(hours=2)
+
+def _is_pdf_link(link: str) -> bool:
+    """Check whether an article link points to a PDF (optionally with a query string)"""
+    if not link:
+        return False
+    link_lower = link.lower()
+    return link_lower.endswith('.pdf') or '.pdf?' in link_lower
+
+GEMINI_MODEL_ID = "models/gemini-2.5-flash-preview-05-20"
+
+# Room for the summary plus the key-details list
+SUMMARY_MAX_OUTPUT_TOKENS = 2048
+
+_SUMMARY_INSTRUCTIONS = """Analyze this NSE company filing about a new order. Provide a brief summary followed by key details.
 
 RESPONSE FORMAT:
 First, give a short summary (1-2 sentences) of what this order is about.
@@ -81,94 +90,88 @@ REQUIREMENTS:
 - Be concise but include key numbers
 - Skip unnecessary legal/regulatory boilerplate
 - Focus on business-relevant information
-- Keep details section very brief
+- Keep details section very brief"""
 
-Document text:
-{text}"""
-    
-    try:
-        # Generate response without any tools
-        response = client.models.generate_content(
-            model=model_id,
-            contents=prompt,
-            config=types.GenerateContentConfig(
-                response_modalities=["TEXT"],
-                temperature=0.1,
-                top_p=0.8,
-                top_k=40,
-                max_output_tokens=2048,  # Increased from 1024 to allow longer summaries
-            )
-        )
-        
-        # Extract and return the text response
-        for part in response.candidates[0].content.parts:
-            if part.text:
-                return part.text.strip()
-        
-        return "No response received from Gemini"
-        
-    except Exception as e:
-        raise Exception(f"Error getting Gemini response: {e}")
-
-def summarize_pdf_from_url(url: str) -> str:
-    """
-    Download PDF from URL, extract text, and summarize with Gemini.
-    
-    Args:
-        url (str): The URL of the PDF file
-        
-    Returns:
-        str: Gemini's summary of the PDF content
-    """
-    if not PDF_SUMMARIZATION_AVAILABLE:
-        return "PDF summarization not available - missing dependencies"
-    
-    print(f"Processing PDF from: {url}")
-    
-    # Extract text from PDF
-    text = pdf_url_to_text(url)
-    if not text:
-        raise Exception("Failed to extract text from PDF")
-    
-    print(f"Extracted {len(text)} characters from PDF")
+def _truncate_for_prompt(text: str) -> str:
+    """Truncate extracted PDF text to a safe prompt size"""
+    logger.debug("Extracted %d characters from PDF", len(text))
     
     # Handle very long texts by truncating to avoid token limits
     # Gemini 2.5 Flash can handle ~1M tokens input, but let's be conservative
     max_chars = 100000  # ~25,000 tokens approximately
     if len(text) > max_chars:
-        print(f"⚠️ Text too long ({len(text)} chars), truncating to {max_chars} chars")
+        logger.debug("Text too long (%d chars), truncating to %d chars", len(text), max_chars)
         # Try to truncate at a reasonable point (sentence or paragraph break)
         truncated_text = text[:max_chars]
-        # Find last complete sentence
-        last_period = truncated_text.rfind('.')
-        if last_period > max_chars * 0.8:  # If we find a period in the last 20%
+        # Find the last complete sentence, searching only the last 20%
+        tail_start = int(max_chars * 0.8)
+        last_period = truncated_text.rfind('. ', tail_start)
+        if last_period >= 0:
             text = truncated_text[:last_period + 1]
         else:
             text = truncated_text
-        print(f"Truncated to {len(text)} characters")
+        logger.debug("Truncated to %d characters", len(text))
     
-    print("Sending to Gemini for summarization...")
-    
-    # Summarize with Gemini with retry logic
-    max_retries = 2
-    for attempt in range(max_retries):
-        try:
-            summary = summarize_text_with_gemini(text)
-            
-            # Check if summary seems complete (not truncated)
-            if len(summary) < 50:
-                print(f"⚠️ Summary seems too short ({len(summary)} chars), might be incomplete")
-            
-            return summary
-            
-        except Exception as e:
-            print(f"Attempt {attempt + 1} failed: {e}")
-            if attempt == max_retries - 1:
-                raise Exception(f"Failed to get Gemini summary after {max_retries} attempts: {e}")
-            else:
-                print("Retrying...")
-                import time
-                time.sleep(2)  # Wait 2 seconds before retry
+    return text
+
+def _pdf_summary_cache_key(url: str) -> str:
+    """Cache key for the summary of the PDF at a URL (changes with the model or prompt)"""
+    return content_key(GEMINI_MODEL_ID, _SUMMARY_INSTRUCTIONS, url)
+
+def _cache_pdf_summary(url: str, summary: str):
+    """Remember a PDF's summary by URL so later runs skip the download and Gemini call"""
+    if summary and summary != pdf_summarizer.NO_RESPONSE:
+        get_cache().set_summary(_pdf_summary_cache_key(url), summary)
+
+def _count_financial_successes(financial_data: Dict[str, Dict]) -> int:
+    """Count companies whose financial lookup returned data rather than an error"""
+    return sum(1 for data in financial_data.values() if 'error' not in data)
+
+# Static parts of the alert email
+_EMAIL_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+_EMAIL_HEAD = """
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .header { background-color: #f4f4f4; padding: 20px; border-radius: 5px; margin-bottom: 20px; border: 1px solid #ddd; }
+        .article { border: 1px solid #ddd; margin: 15px 0; padding: 15px; border-radius: 5px; }
+        .article-title { color: #2c3e50; font-size: 18px; font-weight: bold; margin-bottom: 10px; }
+        .article-meta { color: #333 !important; font-size: 13px; margin-bottom: 10px; }
+        .article-summary { margin-bottom: 15px; color: #333; }
+        .financial-data { background-color: #f8f9fa; padding: 15px; border-radius: 5px; margin-top: 15px; }
+        .financial-data h4 { color: #333 !important; }
+        .stats { background-color: #e8f5e8; padding: 20px; border-radius: 5px; margin-bottom: 20px; border: 1px solid #ddd; }
+        table { border-collapse: collapse; width: 100%; margin-top: 10px; }
+        th, td { border: 1px solid #ddd; padding: 8px; text-align: left; color: #333; }
+        th { background-color: #f2f2f2; font-weight: bold; }
+        .link-button { display: inline-block; padding: 8px 16px; background-color: #3498db; color: white !important; text-decoration: none; border-radius: 3px; }
+        .footer { margin-top: 30px; padding-top: 20px; border-top: 1px solid #ddd; color: #333; font-size: 12px; }
+        .no-articles { background-color: #fff3cd; border: 1px solid #ffeaa7; padding: 15px; border-radius: 5px; }
+        p, div, span { color: #333; }
+        h1, h2, h3, h4 { color: #2c3e50; }
+    </style>
+</head>
+<body>
+"""
+
+_EMAIL_NO_ARTICLES = """
+    <div class="no-articles">
+        <h3>No new awards/bagging articles found</h3>
+        <p>No new articles matching awards/bagging criteria were detected since the last check.</p>
+    </div>
+"""
+
+_EMAIL_FOOTER = """
+    <div class="footer">
+        <p>This alert was generated automatically by RSS Awards Processor.</p>
+        <p>Running every 15 minutes to detect new awards/bagging announcements.</p>
+        <p>Only new articles (not previously processed) are included in this alert.</p>
+    </div>
+</body>
+</html>
+"""
 
 class RSSAwardsProcessor:
     """Clean, modular RSS processor for awards/bagging announcements"""
@@ -189,14 +192,20 @@ class RSSAwardsProcessor:
         
         # Initialize components
         self.hash_db = HashDatabaseManager(hash_db_path)
-        self.rss_fetcher = RSSFetcher()  # Uses default database
+        self._articles_db = DatabaseManager()  # Default RSS articles database
+        self.http = get_session()  # Pooled keep-alive session shared by every fetch
+        self.rss_fetcher = RSSFetcher(self._articles_db, session=self.http)
         self.filter_engine = FilterEngine()
+        self._awards_rule = PresetFilters.awards_bagging_filter()
         self.email_sender = EmailSender(email_config["provider"])
         
         # Configuration
         self.email_config = email_config
         self.max_financial_requests = max_financial_requests
         
+        # Enhanced summaries generated during this run, keyed by article link
+        self._summaries: Dict[str, str] = {}
+        
         # Initialize financial tool if available
         self.financial_tool = None
         if FINANCIAL_DATA_AVAILABLE and os.getenv('GEMINI_API_KEY'):
@@ -208,6 +217,10 @@ class RSSAwardsProcessor:
         else:
             self.logger.info("📊 Financial data tool not available")
     
+    def close(self):
+        """Release the processor's database connections"""
+        self.hash_db.close()
+    
     def _setup_logging(self) -> logging.Logger:
         """Setup logging for the processor"""
         logging.basicConfig(
@@ -234,11 +247,11 @@ class RSSAwardsProcessor:
                 self.logger.warning(f"RSS fetch completed with {fetch_stats['errors']} errors (likely duplicates)")
             
             # Get articles from RSS database (we'll filter against hash DB separately)
-            from src.data.database_manager import DatabaseManager
-            db_manager = DatabaseManager()
-            
             # Get recent articles (last few hours to ensure we catch everything)
-            articles = db_manager.search_articles(limit=1000)
+            articles = self._articles_db.search_articles(
+                since=datetime.now() - RECENT_ARTICLES_WINDOW,
+                limit=1000
+            )
             
             self.logger.info(
                 f"RSS fetch completed: {fetch_stats['fetched']} fetched, "
@@ -270,8 +283,7 @@ class RSSAwardsProcessor:
         
         try:
             # Apply awards/bagging filter
-            awards_filter = PresetFilters.awards_bagging_filter()
-            filtered_articles = self.filter_engine.apply_rule(articles, awards_filter)
+            filtered_articles = self.filter_engine.apply_rule(articles, self._awards_rule)
             
             self.logger.info(f"Found {len(filtered_articles)} articles matching awards/bagging criteria")
             return filtered_articles
@@ -303,32 +315,7 @@ class RSSAwardsProcessor:
     
     def extract_company_name(self, title: str) -> str:
         """Extract company name from article title"""
-        if not title:
-            return "Unknown Company"
-        
-        cleaned_title = title.strip()
-        
-        # Company name patterns
-        patterns = [
-            r'^([^-]+Limited)',
-            r'^([^-]+Ltd)', 
-            r'^([A-Za-z0-9\s&\(\)\.]+?(?:Limited|Ltd))',
-        ]
-        
-        for pattern in patterns:
-            match = re.match(pattern, cleaned_title, re.IGNORECASE)
-            if match:
-                return re.sub(r'\s+', ' ', match.group(1).strip())
-        
-        # Fallback: extract before separators
-        separators = [' has informed', ' informs', '-', '|']
-        for sep in separators:
-            if sep in cleaned_title:
-                potential = cleaned_title.split(sep)[0].strip()
-                if len(potential) > 3:
-                    return potential
-        
-        return cleaned_title[:50].strip()
+        return extract_company_name(title)
     
     def get_financial_data(self, articles: List[Dict]) -> Dict[str, Dict]:
         """
@@ -346,75 +333,74 @@ class RSSAwardsProcessor:
         
         self.logger.info("💰 Getting financial data...")
         
-        financial_data = {}
-        processed_count = 0
-        
+        # Unique companies in article order, up to the per-run request limit
+        companies = []
         for article in articles:
-            if processed_count >= self.max_financial_requests:
-                self.logger.info(f"Reached max financial requests limit ({self.max_financial_requests})")
-                break
-            
-            try:
-                company_name = self.extract_company_name(article['title'])
-                
-                # Skip if already processed this company
-                if company_name in financial_data:
-                    continue
-                
-                self.logger.info(f"📈 Getting financial data for: {company_name}")
-                
-                # Get financial data with retry logic
-                data = None
-                max_retries = 2
-                for attempt in range(max_retries):
-                    try:
-                        data = self.financial_tool.get_company_financial_data(company_name)
-                        
-                        if "error" not in data:
-                            financial_data[company_name] = data
-                            self.logger.info(f"✅ Financial data retrieved for {company_name}")
-                            break
-                        else:
-                            if attempt < max_retries - 1:
-                                self.logger.warning(f"⚠️ Attempt {attempt + 1} failed for {company_name}, retrying...")
-                                import time
-                                time.sleep(2)  # Wait 2 seconds before retry
-                            else:
-                                self.logger.warning(f"⚠️ Could not get financial data for {company_name} after {max_retries} attempts")
-                                financial_data[company_name] = {"error": data["error"]}
-                                
-                    except Exception as e:
-                        if attempt < max_retries - 1:
-                            self.logger.warning(f"⚠️ Exception on attempt {attempt + 1} for {company_name}: {e}, retrying...")
-                            import time
-                            time.sleep(2)
-                        else:
-                            self.logger.warning(f"⚠️ Could not get financial data for {company_name} after {max_retries} attempts: {e}")
-                            financial_data[company_name] = {"error": str(e)}
-                
-                processed_count += 1
-                
-            except Exception as e:
-                self.logger.error(f"Error getting financial data for {article.get('title', 'unknown')}: {e}")
-                continue
+            company_name = self.extract_company_name(article.get('title', ''))
+            if company_name not in companies:
+                companies.append(company_name)
+        if len(companies) > self.max_financial_requests:
+            self.logger.info(f"Reached max financial requests limit ({self.max_financial_requests})")
+            companies = companies[:self.max_financial_requests]
+        if not companies:
+            return {}
+        
+        # Lookups are network-bound, so run them concurrently; the shared Gemini
+        # semaphore keeps them (and any summary prefetch) within quota
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_GEMINI_CALLS, len(companies))) as executor:
+            financial_data = dict(zip(companies, executor.map(self._fetch_with_retry, companies)))
         
-        success_count = len([k for k, v in financial_data.items() if 'error' not in v])
+        success_count = _count_financial_successes(financial_data)
         self.logger.info(f"Financial data retrieved for {success_count}/{len(financial_data)} companies")
         
         return financial_data
     
-    def create_simple_email_content(self, articles: List[Dict], financial_data: Dict[str, Dict]) -> Tuple[str, str]:
+    def _fetch_with_retry(self, company_name: str, max_retries: int = 2) -> Dict:
+        """
+        Get financial data for one company, retrying failed lookups
+        
+        Args:
+            company_name: Company to look up
+            max_retries: Total number of attempts
+            
+        Returns:
+            Financial data, or a dict with an "error" key
+        """
+        self.logger.info(f"📈 Getting financial data for: {company_name}")
+        
+        def fetch() -> Dict:
+            with gemini_semaphore:
+                data = self.financial_tool.get_company_financial_data(company_name)
+            if "error" in data:
+                raise Exception(data["error"])
+            return data
+        
+        try:
+            data = retry(fetch, attempts=max_retries, description=f"financial data for {company_name}")
+        except Exception as e:
+            self.logger.warning(f"⚠️ Could not get financial data for {company_name}: {e}")
+            return {"error": str(e)}
+        
+        self.logger.info(f"✅ Financial data retrieved for {company_name}")
+        return data
+    
+    def create_simple_email_content(self, articles: List[Dict], financial_data: Dict[str, Dict],
+                                    summaries: Optional[Dict[str, str]] = None,
+                                    generated_at: Optional[str] = None) -> Tuple[str, str]:
         """
         Create rich HTML email content with financial data tables
         
         Args:
             articles: List of new articles
             financial_data: Financial data for companies
+            summaries: Prefetched enhanced summaries keyed by article link
+            generated_at: Preformatted generation timestamp, defaults to now
             
         Returns:
             Tuple of (subject, html_body)
         """
-        now = datetime.now()
+        generated_at = generated_at or datetime.now().strftime(_EMAIL_TIMESTAMP_FORMAT)
+        summaries = summaries or {}
         
         # Rich subject
         if len(articles) == 1:
@@ -422,137 +408,104 @@ class RSSAwardsProcessor:
         else:
             subject = f"[Market News] Update: {len(articles)} companies"
         
-        # HTML Email Body
-        html_body = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <style>
-        body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-        .header {{ background-color: #f4f4f4; padding: 20px; border-radius: 5px; margin-bottom: 20px; border: 1px solid #ddd; }}
-        .article {{ border: 1px solid #ddd; margin: 15px 0; padding: 15px; border-radius: 5px; }}
-        .article-title {{ color: #2c3e50; font-size: 18px; font-weight: bold; margin-bottom: 10px; }}
-        .article-meta {{ color: #333 !important; font-size: 13px; margin-bottom: 10px; }}
-        .article-summary {{ margin-bottom: 15px; color: #333; }}
-        .financial-data {{ background-color: #f8f9fa; padding: 15px; border-radius: 5px; margin-top: 15px; }}
-        .financial-data h4 {{ color: #333 !important; }}
-        .stats {{ background-color: #e8f5e8; padding: 20px; border-radius: 5px; margin-bottom: 20px; border: 1px solid #ddd; }}
-        table {{ border-collapse: collapse; width: 100%; margin-top: 10px; }}
-        th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; color: #333; }}
-        th {{ background-color: #f2f2f2; font-weight: bold; }}
-        .link-button {{ display: inline-block; padding: 8px 16px; background-color: #3498db; color: white !important; text-decoration: none; border-radius: 3px; }}
-        .footer {{ margin-top: 30px; padding-top: 20px; border-top: 1px solid #ddd; color: #333; font-size: 12px; }}
-        .no-articles {{ background-color: #fff3cd; border: 1px solid #ffeaa7; padding: 15px; border-radius: 5px; }}
-        p, div, span {{ color: #333; }}
-        h1, h2, h3, h4 {{ color: #2c3e50; }}
-    </style>
-</head>
-<body>
-    <div class="header">
+        # HTML Email Body, assembled from fragments and joined once.
+        # Feed and API text is escaped; only our own markup is emitted raw.
+        parts: List[str] = [_EMAIL_HEAD]
+        parts.append(f"""    <div class="header">
         <h1>RSS Awards/Bagging Alert</h1>
         <ul>
-            <li><strong>Generated:</strong> {now.strftime('%Y-%m-%d %H:%M:%S')}</li>
+            <li><strong>Generated:</strong> {generated_at}</li>
             <li><strong>New Articles Found:</strong> {len(articles)}</li>
         </ul>
     </div>
-"""
+""")
 
         if not articles:
-            html_body += """
-    <div class="no-articles">
-        <h3>No new awards/bagging articles found</h3>
-        <p>No new articles matching awards/bagging criteria were detected since the last check.</p>
-    </div>
-"""
+            parts.append(_EMAIL_NO_ARTICLES)
         else:
-            html_body += f"""
+            success_count = _count_financial_successes(financial_data)
+            error_count = len(financial_data) - success_count
+            parts.append(f"""
     <div class="stats">
         <h2>Summary</h2>
         <ul>
             <li><strong>New Articles:</strong> {len(articles)}</li>
-            <li><strong>Companies with Financial Data:</strong> {len([k for k, v in financial_data.items() if 'error' not in v])}</li>
-            <li><strong>Financial Data Errors:</strong> {len([k for k, v in financial_data.items() if 'error' in v])}</li>
+            <li><strong>Companies with Financial Data:</strong> {success_count}</li>
+            <li><strong>Financial Data Errors:</strong> {error_count}</li>
         </ul>
     </div>
 
     <h2>New Awards/Bagging Articles</h2>
-"""
+""")
             
             for i, article in enumerate(articles, 1):
                 company_name = self.extract_company_name(article['title'])
+                company_html = escape(company_name)
                 
-                html_body += f"""
+                parts.append(f"""
     <div class="article">
-        <div class="article-title">{i}. {article['title']}</div>
+        <div class="article-title">{i}. {escape(article['title'])}</div>
         <div class="article-meta">
-            Published: {article.get('published', 'Unknown date')} | 
-            Company: {company_name}
+            Published: {escape(str(article.get('published', 'Unknown date')))} | 
+            Company: {company_html}
         </div>
         <div class="article-summary">
-            <strong>Summary:</strong> {self._get_enhanced_summary(article)}
+            <strong>Summary:</strong> {self._get_enhanced_summary(article, summaries)}
         </div>
-        <a href="{article.get('link', '#')}" class="link-button">Read Full Article</a>
-"""
+        <a href="{escape(article.get('link', '#'))}" class="link-button">Read Full Article</a>
+""")
                 
                 # Add financial data if available
                 if company_name in financial_data:
                     fin_data = financial_data[company_name]
                     if "error" not in fin_data:
-                        html_body += f"""
+                        parts.append(f"""
         <div class="financial-data">
-            <h4>Financial Data for {company_name}</h4>
+            <h4>Financial Data for {company_html}</h4>
             <table>
                 <tr><th>Fiscal Year</th><th>Revenue (Rs. crore)</th><th>Order Book (Rs. crore)</th><th>OB/Revenue Ratio</th></tr>
-"""
+""")
                         
                         # Add audited data
                         if fin_data.get('audited_data'):
                             aud = fin_data['audited_data']
-                            html_body += f"""
+                            parts.append(f"""
                 <tr>
-                    <td>{aud.get('fiscal_year', 'N/A')}</td>
-                    <td>{aud.get('revenue_crores', 'N/A')}</td>
-                    <td>{aud.get('orderbook_crores', 'N/A')}</td>
-                    <td>{aud.get('orderbook_revenue_ratio', 'N/A')}</td>
+                    <td>{escape(str(aud.get('fiscal_year', 'N/A')))}</td>
+                    <td>{escape(str(aud.get('revenue_crores', 'N/A')))}</td>
+                    <td>{escape(str(aud.get('orderbook_crores', 'N/A')))}</td>
+                    <td>{escape(str(aud.get('orderbook_revenue_ratio', 'N/A')))}</td>
                 </tr>
-"""
+""")
                         
                         # Add provisional data
                         if fin_data.get('provisional_data'):
                             prov = fin_data['provisional_data']
-                            html_body += f"""
+                            parts.append(f"""
                 <tr>
-                    <td>{prov.get('fiscal_year', 'N/A')}*</td>
-                    <td>{prov.get('revenue_crores', 'N/A')}</td>
-                    <td>{prov.get('orderbook_crores', 'N/A')}</td>
-                    <td>{prov.get('orderbook_revenue_ratio', 'N/A')}</td>
+                    <td>{escape(str(prov.get('fiscal_year', 'N/A')))}*</td>
+                    <td>{escape(str(prov.get('revenue_crores', 'N/A')))}</td>
+                    <td>{escape(str(prov.get('orderbook_crores', 'N/A')))}</td>
+                    <td>{escape(str(prov.get('orderbook_revenue_ratio', 'N/A')))}</td>
                 </tr>
-"""
+""")
                         
-                        html_body += "</table>"
+                        parts.append("</table>")
                         if fin_data.get('provisional_data'):
-                            html_body += "<p><small>*Provisional and unaudited data</small></p>"
-                        html_body += "</div>"
+                            parts.append("<p><small>*Provisional and unaudited data</small></p>")
+                        parts.append("</div>")
                     else:
-                        html_body += f"""
+                        parts.append(f"""
         <div class="financial-data">
-            <p><strong>Financial Data:</strong> ⚠️ {fin_data.get('error', 'Unknown error')}</p>
+            <p><strong>Financial Data:</strong> ⚠️ {escape(str(fin_data.get('error', 'Unknown error')))}</p>
         </div>
-"""
+""")
                 
-                html_body += "</div>"
+                parts.append("</div>")
 
-        html_body += """
-    <div class="footer">
-        <p>This alert was generated automatically by RSS Awards Processor.</p>
-        <p>Running every 15 minutes to detect new awards/bagging announcements.</p>
-        <p>Only new articles (not previously processed) are included in this alert.</p>
-    </div>
-</body>
-</html>
-"""
+        parts.append(_EMAIL_FOOTER)
         
-        return subject, html_body
+        return subject, "".join(parts)
     
     def send_email_alert(self, articles: List[Dict], financial_data: Dict[str, Dict]) -> bool:
         """
@@ -572,8 +525,14 @@ class RSSAwardsProcessor:
         self.logger.info(f"📧 Sending email alert for {len(articles)} new articles...")
         
         try:
+            # Generate PDF summaries concurrently before rendering
+            summaries = self.prefetch_summaries(articles)
+            
             # Create email content
-            subject, html_body = self.create_simple_email_content(articles, financial_data)
+            generated_at = datetime.now().strftime(_EMAIL_TIMESTAMP_FORMAT)
+            subject, html_body = self.create_simple_email_content(
+                articles, financial_data, summaries, generated_at=generated_at
+            )
             
             # Send email
             success = self.email_sender.send_email(
@@ -641,52 +600,140 @@ class RSSAwardsProcessor:
             return {}
     
     def cleanup_old_data(self, days_to_keep: int = 30) -> int:
-        """Clean up old processed hashes"""
+        """Clean up old processed hashes and expired cache entries"""
         try:
+            get_cache().prune()
             return self.hash_db.cleanup_old_hashes(days_to_keep)
         except Exception as e:
             self.logger.error(f"Error cleaning up old data: {e}")
             return 0
     
-    def _get_enhanced_summary(self, article: Dict) -> str:
+    def prefetch_summaries(self, articles: List[Dict]) -> Dict[str, str]:
         """
-        Get enhanced summary using Gemini for PDFs or fallback to RSS summary
+        Generate enhanced summaries for PDF-linked articles concurrently
+        
+        All PDFs are downloaded concurrently, then parsed, then summarized
+        together in as few batched Gemini calls as possible. Results are
+        kept on the processor, so links already summarized during this run
+        are not redone.
         
         Args:
-            article: Article dictionary with title, link, summary, etc.
+            articles: List of articles to summarize
             
         Returns:
-            Enhanced summary string
+            Dictionary mapping article links to enhanced summaries
         """
-        try:
-            # Check if article link points to a PDF
-            article_link = article.get('link', '')
-            if article_link and (article_link.lower().endswith('.pdf') or 'pdf' in article_link.lower()):
-                self.logger.info(f"📄 Found PDF link, generating Gemini summary: {article_link}")
-                
-                try:
-                    # Use Gemini to summarize the PDF
-                    gemini_summary = summarize_pdf_from_url(article_link)
-                    self.logger.info(f"✅ Gemini summary generated ({len(gemini_summary)} chars): {gemini_summary[:100]}...")
-                    
-                    # Check if summary seems truncated
-                    if len(gemini_summary) < 100:
-                        self.logger.warning(f"⚠️ Summary seems very short, might be incomplete: '{gemini_summary}'")
-                    
-                    # Convert newlines to HTML breaks for proper email formatting
-                    formatted_summary = gemini_summary.replace('\n', '<br>')
-                    return formatted_summary
-                except Exception as e:
-                    self.logger.warning(f"⚠️ Failed to generate Gemini summary for PDF: {e}")
-                    # Fallback to RSS summary
-                    return article.get('summary', 'No summary available')
+        pending = {}
+        for article in articles:
+            link = article.get('link', '')
+            if _is_pdf_link(link) and link not in self._summaries:
+                pending.setdefault(link, article)
+        
+        # Filings summarized in an earlier run are cached by URL
+        if pending and PDF_SUMMARIZATION_AVAILABLE:
+            cache = get_cache()
+            for link in list(pending):
+                cached_summary = cache.get_summary(_pdf_summary_cache_key(link))
+                if cached_summary is not None:
+                    self._summaries[link] = self._format_summary(pending.pop(link), cached_summary)
+        
+        if pending:
+            self.logger.info(f"📄 Prefetching {len(pending)} PDF summaries...")
+            
+            pending_articles = list(pending.values())
+            if PDF_SUMMARIZATION_AVAILABLE:
+                # Download every PDF concurrently before parsing any of them
+                contents = fetch_pdfs(list(pending), max_workers=SUMMARY_MAX_WORKERS)
+                texts = [self._extract_pdf_text(article, contents.get(article['link'])) for article in pending_articles]
             else:
-                # No PDF link, use original RSS summary
-                return article.get('summary', 'No summary available')
-                
+                texts = [None] * len(pending_articles)
+            
+            # One batched Gemini call (or a few) for every extracted document
+            extracted = [i for i, text in enumerate(texts) if text]
+            generated: List[Optional[str]] = []
+            if extracted:
+                generated = pdf_summarizer.summarize_texts_with_gemini(
+                    [texts[i] for i in extracted], _SUMMARY_INSTRUCTIONS, SUMMARY_MAX_OUTPUT_TOKENS
+                )
+            
+            results = dict(zip(extracted, generated))
+            for i, summary in results.items():
+                _cache_pdf_summary(pending_articles[i]['link'], summary)
+            for i, article in enumerate(pending_articles):
+                self._summaries[article['link']] = self._format_summary(article, results.get(i))
+        
+        summaries = {}
+        for article in articles:
+            link = article.get('link', '')
+            if link in self._summaries:
+                summaries[link] = self._summaries[link]
+        return summaries
+    
+    def _extract_pdf_text(self, article: Dict, pdf_content: Optional[bytes]) -> Optional[str]:
+        """
+        Extract the text of an article's downloaded PDF
+        
+        Args:
+            article: Article dictionary with a PDF link
+            pdf_content: The downloaded PDF, or None if the download failed
+            
+        Returns:
+            Extracted text, or None if the PDF could not be read
+        """
+        article_link = article.get('link', '')
+        self.logger.info(f"📄 Found PDF link, generating Gemini summary: {article_link}")
+        
+        try:
+            if pdf_content is None:
+                raise Exception("Failed to download PDF")
+            
+            text = pdf_bytes_to_text(pdf_content)
+            if not text:
+                raise Exception("Failed to extract text from PDF")
+            
+            return _truncate_for_prompt(text)
         except Exception as e:
-            self.logger.error(f"Error getting enhanced summary: {e}")
-            return article.get('summary', 'No summary available')
+            self.logger.warning(f"⚠️ Failed to generate Gemini summary for PDF: {e}")
+            return None
+    
+    def _format_summary(self, article: Dict, gemini_summary: Optional[str]) -> str:
+        """
+        Format a Gemini summary as email HTML, falling back to the RSS summary
+        
+        Args:
+            article: Article dictionary with title, link, summary, etc.
+            gemini_summary: Generated summary, or None if generation failed
+            
+        Returns:
+            Enhanced summary string (HTML-escaped)
+        """
+        if not gemini_summary:
+            return escape(article.get('summary', 'No summary available'))
+        
+        self.logger.info(f"✅ Gemini summary generated ({len(gemini_summary)} chars): {gemini_summary[:100]}...")
+        
+        # Check if summary seems truncated
+        if len(gemini_summary) < 100:
+            self.logger.warning(f"⚠️ Summary seems very short, might be incomplete: '{gemini_summary}'")
+        
+        # Convert newlines to HTML breaks for proper email formatting
+        return escape(gemini_summary).replace('\n', '<br>')
+    
+    def _get_enhanced_summary(self, article: Dict, summaries: Dict[str, str]) -> str:
+        """
+        Get the prefetched enhanced summary for an article or fall back to the RSS summary
+        
+        Args:
+            article: Article dictionary with title, link, summary, etc.
+            summaries: Prefetched summaries keyed by article link
+            
+        Returns:
+            Enhanced summary string (HTML-escaped)
+        """
+        summary = summaries.get(article.get('link', ''))
+        if summary is not None:
+            return summary
+        return escape(article.get('summary', 'No summary available'))
 
 def process_rss_awards(email_config: Dict[str, str], 
                       hash_db_path: str = "processed_articles.db",
@@ -744,9 +791,19 @@ def process_rss_awards(email_config: Dict[str, str],
             results["processing_time"] = (results["end_time"] - start_time).total_seconds()
             return results
         
-        # Step 4: Get financial data for new articles
-        financial_data = processor.get_financial_data(new_articles)
-        results["financial_data_count"] = len([k for k, v in financial_data.items() if 'error' not in v])
+        # Step 4: Get financial data for new articles while PDF summaries
+        # are generated in the background (both stages are network-bound)
+        with ThreadPoolExecutor(max_workers=1) as background:
+            summaries_future = background.submit(processor.prefetch_summaries, new_articles)
+            financial_data = processor.get_financial_data(new_articles)
+            
+            try:
+                summaries_future.result()
+            except Exception as e:
+                warning_msg = f"Failed to prefetch PDF summaries: {e}"
+                results["warnings"].append(warning_msg)
+                processor.logger.warning(warning_msg)
+        results["financial_data_count"] = _count_financial_successes(financial_data)
         
         # Step 5: Send email alert
         email_sent = processor.send_email_alert(new_articles, financial_data)
@@ -771,14 +828,12 @@ def process_rss_awards(email_config: Dict[str, str],
             "success": len(results["errors"]) == 0  # Warnings don't count as failures
         })
         
-        processor.logger.info("🎉 RSS awards processing completed!")
-        processor.logger.info(f"⏱️ Processing time: {processing_time:.2f}s")
-        processor.logger.info(f"📊 New articles: {len(new_articles)}")
-        processor.logger.info(f"💰 Financial data: {results['financial_data_count']}")
-        processor.logger.info(f"📧 Email sent: {'Yes' if email_sent else 'No'}")
-        
-        if results["warnings"]:
-            processor.logger.info(f"⚠️ Warnings: {len(results['warnings'])}")
+        # The scheduler logs the run summary; keep a single record here for standalone debugging
+        processor.logger.debug(
+            "🎉 RSS awards processing completed in %.2fs: %d new articles, %d financial, email sent: %s, %d warnings",
+            processing_time, len(new_articles), results['financial_data_count'],
+            'Yes' if email_sent else 'No', len(results['warnings'])
+        )
         
         return results
         
@@ -789,6 +844,11 @@ def process_rss_awards(email_config: Dict[str, str],
         results["end_time"] = datetime.now()
         results["processing_time"] = (results["end_time"] - start_time).total_seconds()
         return results
+    
+    finally:
+        # Housekeeping runs every time, including runs with nothing new
+        processor.cleanup_old_data()
+        processor.close()
 
 def get_email_config_from_env() -> Dict[str, str]:
     """
@@ -6,13 +6,17 @@ Runs the RSS awards processor every 15 minutes using APScheduler.
 Includes proper error handling, logging, and graceful shutdown.
 """
 
+import atexit
 import logging
+import queue
 import signal
 import sys
 import time
 import threading
-from datetime import datetime, timedelta
-from apscheduler.schedulers.blocking import BlockingScheduler
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from apscheduler.events import EVENT_JOB_EXECUTED
+from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.executors.pool import ThreadPoolExecutor
 import os
@@ -23,6 +27,7 @@ load_dotenv()
 
 # Import the RSS processor
 from src.core.processor import process_rss_awards, get_email_config_from_env
+from src.config.settings import LOGGING_CONFIG
 
 class RSSScheduler:
     """Scheduler for RSS Awards Processor with sleep/wake detection"""
@@ -32,19 +37,38 @@ class RSSScheduler:
         self.scheduler = None
         self.email_config = None
         self.running = False
-        self.last_heartbeat = datetime.now()
-        self.heartbeat_thread = None
+        self.last_run = None
+        self._last_run_clocks = None  # (wall, monotonic) at the end of the last scheduled run
         self.sleep_threshold = 300  # 5 minutes - if gap is longer, assume system was asleep
+        self._stop_event = threading.Event()
         
     def setup_logging(self):
-        """Setup logging for the scheduler"""
+        """
+        Setup logging for the scheduler
+        
+        Records go onto a queue and a background listener thread does the file
+        and console writes, keeping log I/O out of the job's critical path.
+        """
+        formatter = logging.Formatter(LOGGING_CONFIG["format"])
+        file_handler = RotatingFileHandler(
+            'scheduler.log',
+            maxBytes=LOGGING_CONFIG["max_bytes"],
+            backupCount=LOGGING_CONFIG["backup_count"]
+        )
+        stream_handler = logging.StreamHandler(sys.stdout)
+        for handler in (file_handler, stream_handler):
+            handler.setFormatter(formatter)
+        
+        log_queue = queue.Queue(-1)
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))  # Final format applied by the listener
+        self.log_listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+        self.log_listener.start()
+        atexit.register(self.log_listener.stop)  # Flush queued records on exit
+        
         logging.basicConfig(
             level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('scheduler.log'),
-                logging.StreamHandler(sys.stdout)
-            ]
+            handlers=[queue_handler]
         )
         self.logger = logging.getLogger(__name__)
         
@@ -57,70 +81,74 @@ class RSSScheduler:
             self.logger.error(f"❌ Configuration error: {e}")
             sys.exit(1)
     
-    def heartbeat_monitor(self):
-        """Monitor system heartbeat to detect sleep/wake cycles"""
-        while self.running:
-            try:
-                current_time = datetime.now()
-                time_gap = (current_time - self.last_heartbeat).total_seconds()
-                
-                # If the gap is larger than threshold, system likely was asleep
-                if time_gap > self.sleep_threshold:
-                    self.logger.warning(f"⚠️ System sleep detected! Gap: {time_gap:.1f}s")
-                    self.logger.info("🔄 Running catch-up job after wake-up...")
-                    
-                    # Run the processor immediately after wake-up
-                    try:
-                        self.run_processor()
-                    except Exception as e:
-                        self.logger.error(f"❌ Error in catch-up job: {e}")
-                
-                self.last_heartbeat = current_time
-                time.sleep(60)  # Check every minute
-                
-            except Exception as e:
-                self.logger.error(f"❌ Heartbeat monitor error: {e}")
-                time.sleep(60)
+    def _reload_config(self, signum=None, frame=None):
+        """Reload .env and email configuration (SIGHUP), keeping the old config on error"""
+        self.logger.info("🔄 Reloading configuration...")
+        load_dotenv(override=True)
+        
+        try:
+            self.email_config = get_email_config_from_env()
+            self.logger.info("✅ Configuration reloaded successfully")
+        except ValueError as e:
+            self.logger.error(f"❌ Configuration reload failed, keeping previous configuration: {e}")
+    
+    def _on_job_executed(self, event):
+        """Detect sleep/wake from the gap between scheduled runs"""
+        wall_now, monotonic_now = time.time(), time.monotonic()
+        
+        # The monotonic clock stops while the system is suspended, so wall time
+        # running ahead of it measures how long the machine was asleep
+        if self._last_run_clocks:
+            wall_prev, monotonic_prev = self._last_run_clocks
+            slept = (wall_now - wall_prev) - (monotonic_now - monotonic_prev)
+            if slept > self.sleep_threshold:
+                self.logger.warning("⚠️ System sleep detected! Gap: %.1fs", slept)
+                self.logger.info("🔄 Missed runs were coalesced into this catch-up run")
+        
+        self._last_run_clocks = (wall_now, monotonic_now)
     
     def run_processor(self):
         """Run the RSS awards processor with error handling"""
-        job_start_time = datetime.now()
+        # Monotonic clock: durations stay correct across NTP steps and wall-clock jumps
+        job_start_ns = time.perf_counter_ns()
         self.logger.info("🔄 Starting scheduled RSS awards processing...")
         
-        # Update heartbeat when job runs
-        self.last_heartbeat = job_start_time
+        self.last_run = datetime.now()
         
         try:
             # Run the processor
+            max_financial_requests = int(os.getenv("MAX_FINANCIAL_REQUESTS", "10"))
             results = process_rss_awards(
                 email_config=self.email_config,
                 hash_db_path="processed_articles.db",
-                max_financial_requests=10
+                max_financial_requests=max_financial_requests
             )
             
-            # Log results
+            # Log results as a single record
             if results['success']:
-                self.logger.info(f"✅ Processing completed successfully!")
-                self.logger.info(f"   📊 New articles: {results['new_articles_count']}")
-                self.logger.info(f"   💰 Financial data: {results['financial_data_count']}")
-                self.logger.info(f"   📧 Email sent: {'Yes' if results['email_sent'] else 'No'}")
-                self.logger.info(f"   ⏱️ Processing time: {results.get('processing_time', 0):.2f}s")
+                self.logger.info(
+                    "✅ Processing completed successfully: new_articles=%d financial_data=%d "
+                    "email_sent=%s processing_time=%.2fs",
+                    results['new_articles_count'],
+                    results['financial_data_count'],
+                    'yes' if results['email_sent'] else 'no',
+                    results.get('processing_time', 0)
+                )
             else:
-                self.logger.error(f"❌ Processing failed with errors:")
+                self.logger.error("❌ Processing failed with errors:")
                 for error in results['errors']:
-                    self.logger.error(f"   - {error}")
+                    self.logger.error("   - %s", error)
             
             # Log warnings if any
             if results.get('warnings'):
                 for warning in results['warnings']:
-                    self.logger.warning(f"⚠️ {warning}")
+                    self.logger.warning("⚠️ %s", warning)
                     
         except Exception as e:
-            self.logger.error(f"❌ Unexpected error during processing: {e}")
+            self.logger.error("❌ Unexpected error during processing: %s", e)
             
-        job_end_time = datetime.now()
-        job_duration = (job_end_time - job_start_time).total_seconds()
-        self.logger.info(f"🏁 Job completed in {job_duration:.2f}s")
+        job_duration = (time.perf_counter_ns() - job_start_ns) / 1e9
+        self.logger.info("🏁 Job completed in %.2fs", job_duration)
         
     def start(self):
         """Start the scheduler"""
@@ -133,16 +161,16 @@ class RSSScheduler:
         
         # Configure scheduler
         executors = {
-            'default': ThreadPoolExecutor(max_workers=1)  # Only one job at a time
+            'default': ThreadPoolExecutor(max_workers=4)  # Room for ad-hoc jobs next to the processor
         }
         
         job_defaults = {
             'coalesce': True,  # Combine multiple pending executions into one
-            'max_instances': 1,  # Only one instance of the job can run at a time
-            'misfire_grace_time': 600  # 10 minutes grace time for missed jobs (increased)
+            'max_instances': 1,  # Only one instance of each job can run at a time
+            'misfire_grace_time': 86400  # Runs missed while asleep still fire (once, coalesced) on wake
         }
         
-        self.scheduler = BlockingScheduler(
+        self.scheduler = BackgroundScheduler(
             executors=executors,
             job_defaults=job_defaults,
             timezone='UTC'  # Use UTC to avoid timezone issues
@@ -156,29 +184,34 @@ class RSSScheduler:
             name='RSS Awards Processor',
             replace_existing=True
         )
+        self.scheduler.add_listener(self._on_job_executed, EVENT_JOB_EXECUTED)
         
-        # Setup signal handlers for graceful shutdown
+        # Setup signal handlers for graceful shutdown and config reload
         signal.signal(signal.SIGTERM, self._signal_handler)
         signal.signal(signal.SIGINT, self._signal_handler)
+        if hasattr(signal, 'SIGHUP'):
+            signal.signal(signal.SIGHUP, self._reload_config)
+        atexit.register(self.stop)
         
         try:
             self.running = True
             self.logger.info("✅ Scheduler started successfully")
             
-            # Start heartbeat monitor in separate thread
-            self.heartbeat_thread = threading.Thread(target=self.heartbeat_monitor, daemon=True)
-            self.heartbeat_thread.start()
-            self.logger.info("💓 Heartbeat monitor started")
-            
             self.logger.info("🔄 Running initial check...")
             
             # Run once immediately on startup
             self.run_processor()
+            self._on_job_executed(None)
             
-            self.logger.info("⏰ Scheduler is now running. Press Ctrl+C to stop.")
+            # A shutdown signal during the initial run lets it finish, then exits
+            if self._stop_event.is_set():
+                return
             
-            # Start the scheduler (this will block)
+            # Jobs run on the scheduler's worker threads; the main thread
+            # only waits for a shutdown signal
             self.scheduler.start()
+            self.logger.info("⏰ Scheduler is now running. Press Ctrl+C to stop.")
+            self._stop_event.wait()
             
         except KeyboardInterrupt:
             self.logger.info("🛑 Received interrupt signal")
@@ -188,23 +221,27 @@ class RSSScheduler:
             self.stop()
     
     def stop(self):
-        """Stop the scheduler gracefully"""
-        if self.running and self.scheduler:
-            self.logger.info("🛑 Stopping scheduler...")
-            self.running = False
+        """Stop the scheduler gracefully, waiting for any running job (safe to call twice)"""
+        if not self.running:
+            return
+        
+        self.logger.info("🛑 Stopping scheduler...")
+        self.running = False
+        self._stop_event.set()
+        
+        if self.scheduler and self.scheduler.running:
             self.scheduler.shutdown(wait=True)
-            
-            # Wait for heartbeat thread to finish
-            if self.heartbeat_thread and self.heartbeat_thread.is_alive():
-                self.heartbeat_thread.join(timeout=5)
-                
-            self.logger.info("✅ Scheduler stopped successfully")
+        
+        self.logger.info("✅ Scheduler stopped successfully")
     
     def _signal_handler(self, signum, frame):
-        """Handle shutdown signals"""
+        """Handle shutdown signals: stop new runs, drain the running job, then let start() exit"""
         self.logger.info(f"🛑 Received signal {signum}")
-        self.stop()
-        sys.exit(0)
+        self._stop_event.set()
+        
+        # Waits for an in-flight job instead of exiting mid-write
+        if self.scheduler and self.scheduler.running:
+            self.scheduler.shutdown(wait=True)
     
     def get_status(self):
         """Get scheduler status"""
@@ -214,7 +251,7 @@ class RSSScheduler:
                 'running': True,
                 'jobs_count': len(jobs),
                 'next_run': jobs[0].next_run_time if jobs else None,
-                'last_heartbeat': self.last_heartbeat
+                'last_run': self.last_run
             }
         return {'running': False}
 
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Cache Manager - Persistent cache for downloaded PDFs, their text and Gemini summaries
+
+PDF downloads, parsing and Gemini calls dominate the cost of a scheduler tick.
+This module stores their results on disk keyed by content hash, so a warm run
+that sees the same document again skips the parse and the Gemini tokens, and
+HTTP validators let unchanged PDFs be revalidated instead of re-downloaded.
+"""
+
+import duckdb
+import hashlib
+import logging
+import os
+import threading
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.config.settings import BLOB_DIR, CACHE_DB_PATH, CACHE_RETENTION_DAYS, DATA_DIR
+
+
+def content_key(*parts) -> str:
+    """Build a SHA-256 cache key from str/bytes parts (a single bytes part hashes as-is)"""
+    digest = hashlib.sha256()
+    for i, part in enumerate(parts):
+        if i:
+            digest.update(b'\0')
+        digest.update(part if isinstance(part, bytes) else str(part).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class CacheManager:
+    """Manages an on-disk cache of PDF text and Gemini summaries"""
+
+    def __init__(self, db_path: str = None, blob_dir: str = None):
+        self.db_path = db_path or str(DATA_DIR / CACHE_DB_PATH)
+        self.blob_dir = Path(blob_dir) if blob_dir else BLOB_DIR
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()  # Serializes use of the shared write connection
+        self._read_lock = threading.Lock()  # Serializes use of the read cursor
+        self._init_database()
+
+    def _init_database(self):
+        """Initialize the cache database and open its long-lived connection"""
+        try:
+            self._conn = duckdb.connect(self.db_path)
+            with self._lock:
+                # Extracted PDF text, zlib-compressed
+                self._conn.execute("""
+                    CREATE TABLE IF NOT EXISTS pdf_text_cache (
+                        cache_key TEXT PRIMARY KEY,
+                        text_blob BLOB,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+
+                # Gemini summaries keyed by model + prompt
+                self._conn.execute("""
+                    CREATE TABLE IF NOT EXISTS summary_cache (
+                        cache_key TEXT PRIMARY KEY,
+                        summary TEXT,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+
+                # HTTP cache validators per URL, pointing at a stored blob
+                self._conn.execute("""
+                    CREATE TABLE IF NOT EXISTS url_meta (
+                        url TEXT PRIMARY KEY,
+                        etag TEXT,
+                        last_mod TEXT,
+                        sha256 TEXT,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+
+                # Lookups get their own cursor on the same database, so a read
+                # doesn't queue behind a write
+                self._read_conn = self._conn.cursor()
+
+                self.logger.info("Cache database initialized successfully")
+
+        except Exception as e:
+            self.logger.error(f"Failed to initialize cache database: {e}")
+            raise
+
+    def get_text(self, cache_key: str) -> Optional[str]:
+        """Get cached PDF text, or None on a miss"""
+        try:
+            with self._read_lock:
+                row = self._read_conn.execute(
+                    "SELECT text_blob FROM pdf_text_cache WHERE cache_key = ?",
+                    [cache_key]
+                ).fetchone()
+
+                return zlib.decompress(row[0]).decode('utf-8') if row else None
+
+        except Exception as e:
+            self.logger.warning(f"Error reading cached text {cache_key}: {e}")
+            return None
+
+    def set_text(self, cache_key: str, text: str) -> bool:
+        """Store PDF text in the cache"""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO pdf_text_cache (cache_key, text_blob) VALUES (?, ?)",
+                    [cache_key, zlib.compress(text.encode('utf-8'))]
+                )
+                return True
+
+        except Exception as e:
+            self.logger.warning(f"Error caching text {cache_key}: {e}")
+            return False
+
+    def get_summary(self, cache_key: str) -> Optional[str]:
+        """Get a cached summary, or None on a miss"""
+        try:
+            with self._read_lock:
+                row = self._read_conn.execute(
+                    "SELECT summary FROM summary_cache WHERE cache_key = ?",
+                    [cache_key]
+                ).fetchone()
+
+                return row[0] if row else None
+
+        except Exception as e:
+            self.logger.warning(f"Error reading cached summary {cache_key}: {e}")
+            return None
+
+    def set_summary(self, cache_key: str, summary: str) -> bool:
+        """Store a summary in the cache"""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO summary_cache (cache_key, summary) VALUES (?, ?)",
+                    [cache_key, summary]
+                )
+                return True
+
+        except Exception as e:
+            self.logger.warning(f"Error caching summary {cache_key}: {e}")
+            return False
+
+    def get_url_meta(self, url: str) -> Optional[Dict]:
+        """Get stored HTTP validators for a URL"""
+        try:
+            with self._read_lock:
+                row = self._read_conn.execute(
+                    "SELECT etag, last_mod, sha256 FROM url_meta WHERE url = ?",
+                    [url]
+                ).fetchone()
+
+                if not row:
+                    return None
+
+                return {'etag': row[0], 'last_mod': row[1], 'sha256': row[2]}
+
+        except Exception as e:
+            self.logger.warning(f"Error reading URL metadata for {url}: {e}")
+            return None
+
+    def set_url_meta(self, url: str, etag: Optional[str], last_mod: Optional[str], sha256: str) -> bool:
+        """Store HTTP validators for a URL"""
+        try:
+            with self._lock:
+                self._conn.execute("""
+                    INSERT OR REPLACE INTO url_meta (url, etag, last_mod, sha256, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                """, [url, etag, last_mod, sha256, datetime.now()])
+                return True
+
+        except Exception as e:
+            self.logger.warning(f"Error storing URL metadata for {url}: {e}")
+            return False
+
+    def prune(self, days_to_keep: int = CACHE_RETENTION_DAYS) -> int:
+        """
+        Remove cache entries and stored PDFs older than days_to_keep
+
+        Text, summaries and URL validators are dropped by age. A blob is only
+        deleted once it is past the cutoff and no remaining URL points at it,
+        so a document still being revalidated keeps its stored copy.
+
+        Args:
+            days_to_keep: Age in days after which entries expire
+
+        Returns:
+            Number of rows and blobs removed
+        """
+        cutoff = datetime.now() - timedelta(days=days_to_keep)
+        removed = 0
+
+        try:
+            with self._lock:
+                for table, column in (("pdf_text_cache", "created_at"),
+                                      ("summary_cache", "created_at"),
+                                      ("url_meta", "updated_at")):
+                    removed += len(self._conn.execute(
+                        f"DELETE FROM {table} WHERE {column} < ? RETURNING 1", [cutoff]
+                    ).fetchall())
+
+                rows = self._conn.execute("SELECT DISTINCT sha256 FROM url_meta").fetchall()
+                referenced = {row[0] for row in rows}
+
+        except Exception as e:
+            self.logger.warning(f"Error pruning cache entries: {e}")
+            return removed
+
+        cutoff_ts = cutoff.timestamp()
+        for path in self.blob_dir.iterdir():
+            try:
+                if path.name.split('.', 1)[0] not in referenced and path.stat().st_mtime < cutoff_ts:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                pass  # Removed concurrently
+            except Exception as e:
+                self.logger.warning(f"Error pruning blob {path.name}: {e}")
+
+        if removed:
+            self.logger.info("Pruned %d expired cache entries", removed)
+        return removed
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock, self._read_lock:
+            if self._conn is not None:
+                self._read_conn.close()
+                self._conn.close()
+                self._conn = None
+
+    def _blob_path(self, sha256: str) -> Path:
+        """Path of the blob file for a content hash"""
+        return self.blob_dir / f"{sha256}.pdf"
+
+    def has_blob(self, sha256: str) -> bool:
+        """Check whether a blob is stored for a content hash"""
+        return self._blob_path(sha256).exists()
+
+    def get_blob(self, sha256: str) -> Optional[bytes]:
+        """Read a stored blob, or None if missing"""
+        try:
+            return self._blob_path(sha256).read_bytes()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"Error reading blob {sha256}: {e}")
+            return None
+
+    def put_blob(self, sha256: str, content: bytes) -> bool:
+        """Store a blob under its content hash (atomic rename)"""
+        path = self._blob_path(sha256)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_bytes(content)
+            os.replace(tmp_path, path)
+            return True
+
+        except Exception as e:
+            self.logger.warning(f"Error storing blob {sha256}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return False
+
+
+_cache: Optional[CacheManager] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> CacheManager:
+    """Get the process-wide cache manager"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CacheManager()
+    return _cache
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Company Names - Pull the issuing company's name out of an announcement title
+
+Shared by the processor (email subjects, financial lookups) and the hash
+database (the company_name column), so both always agree on the name.
+"""
+
+import functools
+
+# Suffixes that end a company name, matched case-insensitively
+# ('.ltd' covers run-together forms such as "Pvt.Ltd")
+_COMPANY_SUFFIXES = (' limited', ' ltd', '.ltd')
+
+# Fallback separators between the company name and the rest of the title
+_SEPARATORS = (' has informed', ' informs', '-', '|')
+
+
+@functools.lru_cache(maxsize=4096)
+def extract_company_name(title: str) -> str:
+    """
+    Extract the company name from an article title.
+
+    Memoized, since the same titles recur across filtering, lookups,
+    the email and marking.
+
+    Args:
+        title: Announcement title, e.g. "Foo Limited - Bagging of order"
+
+    Returns:
+        The company name, or "Unknown Company" for an empty title
+    """
+    if not title:
+        return "Unknown Company"
+
+    cleaned_title = title.strip()
+
+    # Plain forward scan of the part before any '-': end the name at the
+    # earliest "Limited"/"Ltd" (no regex engine, no backtracking)
+    prefix = cleaned_title.lower().split('-', 1)[0]
+    end = -1
+    for suffix in _COMPANY_SUFFIXES:
+        i = prefix.find(suffix)
+        if i > 0 and (end < 0 or i + len(suffix) < end):
+            end = i + len(suffix)
+    if end > 0:
+        return ' '.join(cleaned_title[:end].split())
+
+    # Fallback: extract before separators
+    for sep in _SEPARATORS:
+        if sep in cleaned_title:
+            potential = cleaned_title.split(sep)[0].strip()
+            if len(potential) > 3:
+                return potential
+
+    return cleaned_title[:50].strip()
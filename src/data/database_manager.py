@@ -62,6 +62,7 @@ class DatabaseManager:
             conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(source_feed)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_hash ON articles(content_hash)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_created ON articles(created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_updated ON articles(updated_at)")
             
             # Create filters table for storing user-defined filters
             conn.execute("""
@@ -203,6 +204,7 @@ class DatabaseManager:
                        exclude_keywords: List[str] = None,
                        date_from: datetime = None,
                        date_to: datetime = None,
+                       since: datetime = None,
                        limit: int = 100,
                        offset: int = 0) -> List[Dict]:
         """High-performance article search with multiple filters"""
@@ -234,6 +236,11 @@ class DatabaseManager:
                 query_parts.append("AND published_parsed <= ?")
                 params.append(date_to)
             
+            # Only articles seen in the feed recently (updated_at is bumped on every fetch)
+            if since:
+                query_parts.append("AND updated_at >= ?")
+                params.append(since)
+            
             # Order by most recent first
             query_parts.append("ORDER BY published_parsed DESC, created_at DESC")
             
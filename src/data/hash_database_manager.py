@@ -9,53 +9,153 @@ to prevent duplicate email alerts when running the RSS processor frequently.
 import duckdb
 import logging
 import hashlib
+import os
+import threading
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Set
 from pathlib import Path
 
+from src.data.company_names import extract_company_name
+
+# Connection tuning: the hash table only sees small point lookups and inserts,
+# so one DuckDB thread and a modest memory cap keep the scheduler lean
+HASH_DB_THREADS = int(os.getenv("HASH_DB_THREADS", "1"))
+HASH_DB_MEMORY_LIMIT = os.getenv("HASH_DB_MEMORY_LIMIT", "256MB")
+HASH_DB_CHECKPOINT_THRESHOLD = "16MB"  # WAL size that triggers a checkpoint
+
 class HashDatabaseManager:
     """Manages a simple database for tracking processed article hashes"""
     
+    # Hash table schema; content_hash holds a raw 16-byte digest
+    CREATE_TABLE_SQL = """
+        CREATE TABLE IF NOT EXISTS {table} (
+            content_hash BLOB PRIMARY KEY,
+            processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            title TEXT,
+            company_name TEXT,
+            article_link TEXT
+        )
+    """
+    
+    # Statements shared by every call, so the same SQL text is always reused
+    EXISTS_SQL = "SELECT 1 FROM processed_hashes WHERE content_hash = ? LIMIT 1"
+    EXISTING_HASHES_SQL = "SELECT content_hash FROM processed_hashes WHERE content_hash = ANY(?)"
+    RECENT_HASHES_SQL = "SELECT content_hash FROM processed_hashes ORDER BY processed_at DESC LIMIT ?"
+    # A hash that is already recorded is left untouched: no delete, no index rewrite
+    INSERT_SQL = """
+        INSERT INTO processed_hashes 
+        (content_hash, processed_at, title, company_name, article_link)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (content_hash) DO NOTHING
+    """
+    # Newest processed_at among rows migrated from MD5 keys; while any such
+    # row remains, lookups also try an article's MD5 digest
+    META_TABLE_SQL = """
+        CREATE TABLE IF NOT EXISTS hash_db_meta (
+            key TEXT PRIMARY KEY,
+            value TIMESTAMP
+        )
+    """
+    STATS_SQL = """
+        SELECT
+            COUNT(*),
+            COUNT(*) FILTER (WHERE processed_at >= $1),
+            COUNT(*) FILTER (WHERE processed_at >= $2),
+            MAX(processed_at)
+        FROM processed_hashes
+    """
+    
     def __init__(self, db_path: str = "processed_articles.db"):
         self.db_path = db_path
         self.logger = logging.getLogger(__name__)
+        self._lock = threading.RLock()  # Serializes use of the shared write connection
+        self._read_lock = threading.Lock()  # Serializes use of the read cursor
+        self._legacy_until = None  # Set while rows keyed by MD5 remain
         self._init_database()
     
     def _init_database(self):
-        """Initialize the hash tracking database"""
+        """Initialize the hash tracking database and open its long-lived connection"""
         try:
-            with duckdb.connect(self.db_path) as conn:
+            self._conn = duckdb.connect(self.db_path)
+            self._conn.execute(f"SET threads = {HASH_DB_THREADS}")
+            self._conn.execute(f"SET memory_limit = '{HASH_DB_MEMORY_LIMIT}'")
+            self._conn.execute(f"SET checkpoint_threshold = '{HASH_DB_CHECKPOINT_THRESHOLD}'")
+            
+            with self._lock:
+                # Databases from before the BLAKE2b switch store MD5 hex strings
+                column = self._conn.execute("""
+                    SELECT data_type FROM information_schema.columns
+                    WHERE table_name = 'processed_hashes' AND column_name = 'content_hash'
+                """).fetchone()
+                self._conn.execute(self.META_TABLE_SQL)
+                if column and column[0] == 'VARCHAR':
+                    self._migrate_hex_hashes()
+                
                 # Create processed hashes table
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS processed_hashes (
-                        content_hash TEXT PRIMARY KEY,
-                        processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        title TEXT,
-                        company_name TEXT,
-                        article_link TEXT
-                    )
-                """)
+                self._conn.execute(self.CREATE_TABLE_SQL.format(table="processed_hashes"))
                 
-                # Create index for fast lookups
-                conn.execute("""
-                    CREATE INDEX IF NOT EXISTS idx_processed_hash 
-                    ON processed_hashes(content_hash)
-                """)
+                # The primary key already indexes content_hash; drop the
+                # duplicate index older databases were created with
+                self._conn.execute("DROP INDEX IF EXISTS idx_processed_hash")
                 
                 # Create index for cleanup operations
-                conn.execute("""
+                self._conn.execute("""
                     CREATE INDEX IF NOT EXISTS idx_processed_date 
                     ON processed_hashes(processed_at)
                 """)
                 
+                # Lookups get their own cursor on the same database, so a read
+                # sees a consistent snapshot without queueing behind a write
+                self._read_conn = self._conn.cursor()
+                
+                self._refresh_legacy_cutoff()
+                
                 self.logger.info("Hash database initialized successfully")
                 
         except Exception as e:
             self.logger.error(f"Failed to initialize hash database: {e}")
             raise
     
-    def generate_content_hash(self, article: Dict) -> str:
-        """Generate a unique hash for an article based on its content"""
+    def _migrate_hex_hashes(self):
+        """Convert a table of MD5 hex strings to raw digest bytes (caller holds the lock)"""
+        self._conn.begin()
+        try:
+            self._conn.execute(self.CREATE_TABLE_SQL.format(table="processed_hashes_blob"))
+            self._conn.execute("""
+                INSERT INTO processed_hashes_blob
+                SELECT unhex(content_hash), processed_at, title, company_name, article_link
+                FROM processed_hashes
+            """)
+            self._conn.execute("""
+                INSERT OR REPLACE INTO hash_db_meta
+                SELECT 'legacy_until', MAX(processed_at) FROM processed_hashes
+            """)
+            self._conn.execute("DROP TABLE processed_hashes")
+            self._conn.execute("ALTER TABLE processed_hashes_blob RENAME TO processed_hashes")
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+        
+        self.logger.info("Migrated processed hashes to binary keys")
+    
+    def _refresh_legacy_cutoff(self):
+        """Stop the MD5 fallback once every migrated row is gone (caller holds the lock)"""
+        row = self._conn.execute("SELECT value FROM hash_db_meta WHERE key = 'legacy_until'").fetchone()
+        legacy_until = row[0] if row else None
+        
+        if legacy_until is not None and not self._conn.execute(
+            "SELECT 1 FROM processed_hashes WHERE processed_at <= ? LIMIT 1", [legacy_until]
+        ).fetchone():
+            legacy_until = None
+        if legacy_until is None and row:
+            self._conn.execute("DELETE FROM hash_db_meta WHERE key = 'legacy_until'")
+            self.logger.info("No MD5-keyed hashes left, legacy lookups disabled")
+        
+        self._legacy_until = legacy_until
+    
+    def _digest_content(self, digest, article: Dict) -> bytes:
+        """Feed an article's title, summary and partial link into a hash object"""
         # Use title, summary, and partial link for hash generation
         title = article.get('title', '').strip()
         summary = article.get('summary', '').strip()
@@ -64,41 +164,46 @@ class HashDatabaseManager:
         # Use first 100 chars of link to handle URL variations
         stable_link = link[:100] if link else ""
         
-        # Combine content for hash
-        content = f"{title}|{summary}|{stable_link}"
-        
-        # Generate MD5 hash
-        return hashlib.md5(content.encode('utf-8')).hexdigest()
+        # Hash the parts as "title|summary|link" without building the joined string
+        digest.update(title.encode('utf-8'))
+        digest.update(b'|')
+        digest.update(summary.encode('utf-8'))
+        digest.update(b'|')
+        digest.update(stable_link.encode('utf-8'))
+        return digest.digest()
+    
+    def generate_content_hash(self, article: Dict) -> bytes:
+        """Generate a unique 16-byte BLAKE2b hash for an article based on its content"""
+        return self._digest_content(hashlib.blake2b(digest_size=16), article)
+    
+    def _legacy_content_hash(self, article: Dict) -> bytes:
+        """MD5 digest of an article, as stored for rows written before the BLAKE2b switch"""
+        return self._digest_content(hashlib.md5(), article)
     
     def is_article_processed(self, article: Dict) -> bool:
         """Check if an article has already been processed"""
-        content_hash = self.generate_content_hash(article)
-        return self.is_hash_processed(content_hash)
+        content_hash = article.get('_content_hash') or self.generate_content_hash(article)
+        if self.is_hash_processed(content_hash):
+            return True
+        return self._legacy_until is not None and self.is_hash_processed(self._legacy_content_hash(article))
     
-    def is_hash_processed(self, content_hash: str) -> bool:
+    def is_hash_processed(self, content_hash: bytes) -> bool:
         """Check if a specific hash has been processed"""
         try:
-            with duckdb.connect(self.db_path) as conn:
-                result = conn.execute(
-                    "SELECT 1 FROM processed_hashes WHERE content_hash = ? LIMIT 1",
-                    [content_hash]
-                ).fetchone()
+            with self._read_lock:
+                result = self._read_conn.execute(self.EXISTS_SQL, [content_hash]).fetchone()
                 
                 return result is not None
                 
         except Exception as e:
-            self.logger.error(f"Error checking hash {content_hash}: {e}")
+            self.logger.error(f"Error checking hash {content_hash.hex()}: {e}")
             return False  # On error, assume not processed to avoid missing articles
     
-    def get_processed_hashes(self, limit: int = 1000) -> Set[str]:
+    def get_processed_hashes(self, limit: int = 1000) -> Set[bytes]:
         """Get a set of recently processed hashes for batch checking"""
         try:
-            with duckdb.connect(self.db_path) as conn:
-                results = conn.execute(
-                    """SELECT content_hash FROM processed_hashes 
-                       ORDER BY processed_at DESC LIMIT ?""",
-                    [limit]
-                ).fetchall()
+            with self._read_lock:
+                results = self._read_conn.execute(self.RECENT_HASHES_SQL, [limit]).fetchall()
                 
                 return {row[0] for row in results}
                 
@@ -109,22 +214,19 @@ class HashDatabaseManager:
     def mark_article_processed(self, article: Dict, company_name: str = None) -> bool:
         """Mark an article as processed"""
         try:
-            content_hash = self.generate_content_hash(article)
+            content_hash = article.get('_content_hash') or self.generate_content_hash(article)
             
-            with duckdb.connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT OR REPLACE INTO processed_hashes 
-                    (content_hash, processed_at, title, company_name, article_link)
-                    VALUES (?, ?, ?, ?, ?)
-                """, [
+            with self._lock:
+                self._conn.execute(self.INSERT_SQL, [
                     content_hash,
                     datetime.now(),
                     article.get('title', '')[:200],  # Limit title length
-                    company_name or self._extract_company_name(article.get('title', '')),
+                    company_name or extract_company_name(article.get('title', '')),
                     article.get('link', '')
                 ])
                 
-                self.logger.debug(f"Marked article as processed: {content_hash}")
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug("Marked article as processed: %s", content_hash.hex())
                 return True
                 
         except Exception as e:
@@ -132,90 +234,126 @@ class HashDatabaseManager:
             return False
     
     def mark_articles_processed(self, articles: List[Dict], company_names: Dict[str, str] = None) -> int:
-        """Mark multiple articles as processed (batch operation)"""
+        """
+        Mark multiple articles as processed (batch operation)
+        
+        Rows are built up front and written with a single executemany in one
+        transaction, so a batch costs one statement plan and one commit. If the
+        insert fails the batch is rolled back.
+        
+        Returns:
+            Number of articles marked (0 if the write failed)
+        """
         if not articles:
             return 0
         
         company_names = company_names or {}
-        processed_count = 0
+        now = datetime.now()
+        
+        rows = []
+        for article in articles:
+            title = article.get('title', '')
+            rows.append((
+                article.get('_content_hash') or self.generate_content_hash(article),
+                now,
+                title[:200],
+                company_names[title] if title in company_names else extract_company_name(title),
+                article.get('link', '')
+            ))
         
         try:
-            with duckdb.connect(self.db_path) as conn:
-                for article in articles:
-                    content_hash = self.generate_content_hash(article)
-                    title = article.get('title', '')
-                    company_name = company_names.get(title, self._extract_company_name(title))
+            with self._lock:
+                self._conn.begin()
+                try:
+                    self._conn.executemany(self.INSERT_SQL, rows)
+                    self._conn.commit()
                     
-                    try:
-                        conn.execute("""
-                            INSERT OR REPLACE INTO processed_hashes 
-                            (content_hash, processed_at, title, company_name, article_link)
-                            VALUES (?, ?, ?, ?, ?)
-                        """, [
-                            content_hash,
-                            datetime.now(),
-                            title[:200],
-                            company_name,
-                            article.get('link', '')
-                        ])
-                        processed_count += 1
-                        
-                    except Exception as e:
-                        self.logger.error(f"Error processing individual article: {e}")
-                        continue
+                except Exception:
+                    self._conn.rollback()
+                    raise
                 
-                self.logger.info(f"Marked {processed_count} articles as processed")
-                return processed_count
+                self.logger.info("Marked %d articles as processed", len(rows))
+                return len(rows)
                 
         except Exception as e:
             self.logger.error(f"Error in batch processing articles: {e}")
-            return processed_count
+            return 0
+    
+    def filter_new_articles_bulk(self, article_hashes: List[bytes]) -> Set[bytes]:
+        """
+        Find which of the given hashes have already been processed
+        
+        The hashes are looked up against the primary key in one query, passed
+        as a single list parameter, so the check is exact however large the
+        table grows and nothing has to be loaded up front.
+        
+        Args:
+            article_hashes: Content hashes to check
+            
+        Returns:
+            The subset of article_hashes that are already processed
+        """
+        unique_hashes = list(dict.fromkeys(article_hashes))
+        if not unique_hashes:
+            return set()
+        
+        try:
+            with self._read_lock:
+                results = self._read_conn.execute(self.EXISTING_HASHES_SQL, [unique_hashes]).fetchall()
+                return {row[0] for row in results}
+                
+        except Exception as e:
+            self.logger.error(f"Error checking processed hashes: {e}")
+            return set()  # On error, assume not processed to avoid missing articles
     
     def filter_new_articles(self, articles: List[Dict]) -> List[Dict]:
-        """Filter out articles that have already been processed"""
+        """
+        Filter out articles that have already been processed
+        
+        Each new article keeps its hash under '_content_hash' so that
+        mark_articles_processed can reuse it instead of hashing again.
+        """
         if not articles:
             return []
         
-        # Get batch of processed hashes for efficiency
-        processed_hashes = self.get_processed_hashes(limit=10000)
+        content_hashes = [self.generate_content_hash(article) for article in articles]
+        processed_hashes = self.filter_new_articles_bulk(content_hashes)
+        candidates = [
+            (article, content_hash) for article, content_hash in zip(articles, content_hashes)
+            if content_hash not in processed_hashes
+        ]
+        
+        # Rows migrated from before the BLAKE2b switch are keyed by MD5 digest;
+        # the extra lookup stops once cleanup_old_hashes has removed them all
+        if candidates and self._legacy_until is not None:
+            legacy_hashes = [self._legacy_content_hash(article) for article, _ in candidates]
+            legacy_processed = self.filter_new_articles_bulk(legacy_hashes)
+            candidates = [
+                candidate for candidate, legacy_hash in zip(candidates, legacy_hashes)
+                if legacy_hash not in legacy_processed
+            ]
         
         new_articles = []
-        for article in articles:
-            content_hash = self.generate_content_hash(article)
-            if content_hash not in processed_hashes:
-                new_articles.append(article)
+        for article, content_hash in candidates:
+            article['_content_hash'] = content_hash
+            new_articles.append(article)
         
-        self.logger.info(f"Filtered {len(articles)} articles -> {len(new_articles)} new articles")
+        self.logger.info("Filtered %d articles -> %d new articles", len(articles), len(new_articles))
         return new_articles
     
     def get_processing_stats(self) -> Dict:
         """Get statistics about processed articles"""
         try:
-            with duckdb.connect(self.db_path) as conn:
-                # Total processed
-                total = conn.execute("SELECT COUNT(*) FROM processed_hashes").fetchone()[0]
-                
-                # Today's processed
-                today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-                today_count = conn.execute(
-                    "SELECT COUNT(*) FROM processed_hashes WHERE processed_at >= ?",
-                    [today_start]
-                ).fetchone()[0]
-                
-                # Last 24 hours
-                day_ago = datetime.now() - timedelta(days=1)
-                last_24h = conn.execute(
-                    "SELECT COUNT(*) FROM processed_hashes WHERE processed_at >= ?",
-                    [day_ago]
-                ).fetchone()[0]
-                
-                # Most recent
-                recent = conn.execute(
-                    "SELECT processed_at FROM processed_hashes ORDER BY processed_at DESC LIMIT 1"
+            now = datetime.now()
+            today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            day_ago = now - timedelta(days=1)
+            
+            # Total, today's, last 24 hours and most recent in a single scan
+            with self._read_lock:
+                total, today_count, last_24h, last_processed = self._read_conn.execute(
+                    self.STATS_SQL, [today_start, day_ago]
                 ).fetchone()
                 
-                last_processed = recent[0] if recent else None
-                
                 return {
                     'total_processed': total,
                     'today_processed': today_count,
@@ -237,16 +375,15 @@ class HashDatabaseManager:
         try:
             cutoff_date = datetime.now() - timedelta(days=days_to_keep)
             
-            with duckdb.connect(self.db_path) as conn:
-                result = conn.execute(
-                    "DELETE FROM processed_hashes WHERE processed_at < ?",
+            with self._lock:
+                deleted_count = len(self._conn.execute(
+                    "DELETE FROM processed_hashes WHERE processed_at < ? RETURNING content_hash",
                     [cutoff_date]
-                )
-                
-                deleted_count = result.fetchone()[0] if result.fetchone() else 0
+                ).fetchall())
                 
                 if deleted_count > 0:
-                    self.logger.info(f"Cleaned up {deleted_count} old processed hashes")
+                    self.logger.info("Cleaned up %d old processed hashes", deleted_count)
+                    self._refresh_legacy_cutoff()
                 
                 return deleted_count
                 
@@ -257,44 +394,22 @@ class HashDatabaseManager:
     def reset_database(self):
         """Reset the database (delete all processed hashes)"""
         try:
-            with duckdb.connect(self.db_path) as conn:
-                conn.execute("DELETE FROM processed_hashes")
+            with self._lock:
+                self._conn.execute("DELETE FROM processed_hashes")
+                self._refresh_legacy_cutoff()
                 self.logger.info("Reset hash database - all processed hashes cleared")
                 
         except Exception as e:
             self.logger.error(f"Error resetting database: {e}")
             raise
     
-    def _extract_company_name(self, title: str) -> str:
-        """Extract company name from article title (helper method)"""
-        import re
-        
-        if not title:
-            return "Unknown"
-        
-        cleaned_title = title.strip()
-        
-        # Company name patterns
-        patterns = [
-            r'^([^-]+Limited)',
-            r'^([^-]+Ltd)',
-            r'^([A-Za-z0-9\s&\(\)\.]+?(?:Limited|Ltd))',
-        ]
-        
-        for pattern in patterns:
-            match = re.match(pattern, cleaned_title, re.IGNORECASE)
-            if match:
-                return re.sub(r'\s+', ' ', match.group(1).strip())
-        
-        # Fallback
-        separators = [' has informed', ' informs', '-', '|']
-        for sep in separators:
-            if sep in cleaned_title:
-                potential = cleaned_title.split(sep)[0].strip()
-                if len(potential) > 3:
-                    return potential
-        
-        return cleaned_title[:50].strip()
+    def close(self):
+        """Close the database connection"""
+        with self._lock, self._read_lock:
+            if self._conn is not None:
+                self._read_conn.close()
+                self._conn.close()
+                self._conn = None
 
 def main():
     """Test the hash database manager"""
@@ -336,6 +451,7 @@ def main():
     stats = hash_db.get_processing_stats()
     print(f"Stats: {stats}")
     
+    hash_db.close()
     print("Hash database test completed!")
 
 if __name__ == "__main__":
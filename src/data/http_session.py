@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Session - Pooled requests session for all outbound fetches
+
+Every scheduler tick pulls the RSS feed and a batch of PDFs from the same few
+exchange hosts. Sharing one pooled session keeps TCP/TLS connections alive
+between requests instead of paying a fresh handshake per download, and a
+per-host token bucket keeps request bursts under the hosts' rate limits.
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Connection pool configuration
+POOL_CONNECTIONS = 10  # Number of distinct hosts to keep pools for
+POOL_MAXSIZE = 16  # Max keep-alive connections per host
+MAX_RETRIES = Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+
+# Per-host rate limiting
+HOST_RATE = float(os.getenv("HTTP_HOST_RATE", "5"))  # Requests per second per host
+MIN_HOST_RATE = 0.1  # Floor when repeatedly throttled
+RATE_PENALTY_SECONDS = 600  # How long a halved rate lasts before doubling back
+MAX_RETRY_AFTER_SECONDS = 60  # Cap on how long a Retry-After header can stall us
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _create_session() -> requests.Session:
+    """Create a requests session with pooled, retrying adapters"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=MAX_RETRIES
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Get the process-wide shared HTTP session.
+
+    Headers are not set on the shared session; callers pass their own
+    per-request headers so RSS and PDF requests don't leak into each other.
+
+    Returns:
+        requests.Session: The shared session
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _create_session()
+    return _session
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds"""
+    if not value:
+        return None
+    
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class HostBucket:
+    """Token bucket state for one host"""
+    rate: float
+    tokens: float
+    updated: float
+    blocked_until: float = 0.0
+    recover_at: Optional[float] = None
+
+
+class HostRateLimiter:
+    """Token-bucket rate limiter keyed by hostname, with adaptive 429 backoff"""
+    
+    def __init__(self, rate: float = HOST_RATE, penalty_seconds: float = RATE_PENALTY_SECONDS):
+        self.base_rate = rate
+        self.penalty_seconds = penalty_seconds
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, HostBucket] = {}
+    
+    def _get_bucket(self, host: str, now: float) -> HostBucket:
+        """Get the bucket for a host, refilled up to now (caller holds the lock)"""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = HostBucket(rate=self.base_rate, tokens=max(1.0, self.base_rate), updated=now)
+            self._buckets[host] = bucket
+        
+        # Exponential recovery: double the rate once per penalty window
+        if bucket.recover_at is not None and now >= bucket.recover_at:
+            bucket.rate = min(self.base_rate, bucket.rate * 2)
+            bucket.recover_at = None if bucket.rate >= self.base_rate else now + self.penalty_seconds
+            self.logger.info(f"Rate limit for {host} recovering: {bucket.rate:.2f} req/s")
+        
+        # Refill tokens; capacity is at least one request
+        capacity = max(1.0, bucket.rate)
+        bucket.tokens = min(capacity, bucket.tokens + (now - bucket.updated) * bucket.rate)
+        bucket.updated = now
+        return bucket
+    
+    def acquire(self, url: str):
+        """Block until a request to the URL's host is allowed"""
+        host = urlparse(url).netloc
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                bucket = self._get_bucket(host, now)
+                if now >= bucket.blocked_until and bucket.tokens >= 1:
+                    bucket.tokens -= 1
+                    return
+                wait = max(bucket.blocked_until - now, (1 - bucket.tokens) / bucket.rate)
+            time.sleep(wait)
+    
+    def penalize(self, url: str, retry_after: Optional[float] = None):
+        """Halve the host's rate after a 429 and honor its Retry-After"""
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._get_bucket(host, now)
+            bucket.rate = max(MIN_HOST_RATE, bucket.rate / 2)
+            bucket.tokens = min(bucket.tokens, max(1.0, bucket.rate))
+            bucket.recover_at = now + self.penalty_seconds
+            if retry_after:
+                bucket.blocked_until = max(bucket.blocked_until, now + min(retry_after, MAX_RETRY_AFTER_SECONDS))
+            
+            self.logger.warning(
+                f"HTTP 429 from {host}, rate limit now {bucket.rate:.2f} req/s"
+                + (f", retrying after {retry_after:.1f}s" if retry_after else "")
+            )
+    
+    def get_rate(self, url: str) -> float:
+        """Get the effective request rate for the URL's host"""
+        host = urlparse(url).netloc
+        with self._lock:
+            return self._get_bucket(host, time.monotonic()).rate
+
+
+_rate_limiter = HostRateLimiter()
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """Get the process-wide per-host rate limiter"""
+    return _rate_limiter
+
+
+def rate_limited_get(url: str, session: Optional[requests.Session] = None, **kwargs) -> requests.Response:
+    """
+    GET a URL through the shared session, throttled per host.
+    
+    A 429 response halves the host's rate, waits out its Retry-After and is
+    retried once.
+    
+    Args:
+        url (str): The URL to fetch
+        session (requests.Session): Session to use, defaults to the shared session
+        **kwargs: Passed through to requests.Session.get
+        
+    Returns:
+        requests.Response: The final response
+    """
+    limiter = get_rate_limiter()
+    session = session or get_session()
+    
+    for attempt in range(2):
+        limiter.acquire(url)
+        response = session.get(url, **kwargs)
+        if response.status_code != 429 or attempt == 1:
+            return response
+        
+        limiter.penalize(url, parse_retry_after(response.headers.get('Retry-After')))
+        response.close()
@@ -8,15 +8,16 @@ from urllib.parse import urlparse
 
 from src.config.settings import RSS_CONFIG, SCHEDULER_CONFIG
 from src.data.database_manager import DatabaseManager
+from src.data.http_session import get_session, rate_limited_get
 
 class RSSFetcher:
     """Modular RSS feed fetcher with database storage"""
     
-    def __init__(self, db_manager: DatabaseManager = None):
+    def __init__(self, db_manager: DatabaseManager = None, session: requests.Session = None):
         self.db_manager = db_manager or DatabaseManager()
         self.logger = logging.getLogger(__name__)
-        self.session = requests.Session()
-        self.session.headers.update(RSS_CONFIG["headers"])
+        self.session = session or get_session()
+        self.headers = RSS_CONFIG["headers"]
     
     def fetch_feed(self, feed_url: str = None, timeout: int = None) -> Optional[feedparser.FeedParserDict]:
         """Fetch and parse RSS feed"""
@@ -26,7 +27,7 @@ class RSSFetcher:
         self.logger.info(f"Fetching RSS feed from: {url}")
         
         try:
-            response = self.session.get(url, timeout=timeout)
+            response = rate_limited_get(url, session=self.session, headers=self.headers, timeout=timeout)
             self.logger.info(f"HTTP Status: {response.status_code}, Content Length: {len(response.content)} bytes")
             
             if response.status_code != 200:
@@ -0,0 +1,4 @@
+"""Shared pytest configuration"""
+
+# gemini_test.py is a manual script that calls the live Gemini API
+collect_ignore = ["gemini_test.py"]
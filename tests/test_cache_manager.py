@@ -0,0 +1,115 @@
+"""Tests for the persistent PDF/summary cache"""
+
+import os
+import threading
+import time
+
+import duckdb
+import pytest
+
+from src.data.cache_manager import CacheManager, content_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = CacheManager(str(tmp_path / "cache.db"), str(tmp_path / "blobs"))
+    yield cache
+    cache.close()
+
+
+def test_summary_and_text_round_trip(cache):
+    assert cache.get_summary("k") is None
+    assert cache.set_summary("k", "summary")
+    assert cache.get_summary("k") == "summary"
+
+    assert cache.set_text("t", "page text " * 100)
+    assert cache.get_text("t") == "page text " * 100
+
+
+def test_entries_survive_reopening(tmp_path):
+    cache = CacheManager(str(tmp_path / "cache.db"), str(tmp_path / "blobs"))
+    cache.set_summary("k", "kept")
+    cache.close()
+
+    reopened = CacheManager(str(tmp_path / "cache.db"), str(tmp_path / "blobs"))
+    try:
+        assert reopened.get_summary("k") == "kept"
+    finally:
+        reopened.close()
+
+
+def test_content_key_separates_parts():
+    assert content_key("ab", "c") != content_key("a", "bc")
+    assert content_key(b"raw") == content_key(b"raw")
+
+
+class ConflictingConnection:
+    """A connection whose statements fail the way concurrent DuckDB writers do"""
+
+    def execute(self, *args, **kwargs):
+        raise duckdb.TransactionException("TransactionContext Error: Conflict on update!")
+
+
+def test_write_conflict_is_a_miss_not_an_error(cache, monkeypatch):
+    cache.set_summary("k", "old")
+    monkeypatch.setattr(cache, "_conn", ConflictingConnection())
+    monkeypatch.setattr(cache, "_read_conn", ConflictingConnection())
+
+    assert cache.set_summary("k", "new") is False
+    assert cache.get_summary("k") is None
+    assert cache.set_text("t", "text") is False
+    assert cache.get_text("t") is None
+    assert cache.set_url_meta("https://example.com/a.pdf", None, None, "abc") is False
+    assert cache.get_url_meta("https://example.com/a.pdf") is None
+
+
+def test_concurrent_writers_never_raise(cache):
+    errors = []
+
+    def writer(n):
+        try:
+            for i in range(20):
+                cache.set_summary("shared", f"writer {n} pass {i}")
+                cache.get_summary("shared")
+        except Exception as e:  # pragma: no cover - the failure being tested for
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert cache.get_summary("shared").startswith("writer ")
+
+
+def test_blob_store(cache):
+    assert not cache.has_blob("abc")
+    assert cache.put_blob("abc", b"%PDF-1.4")
+    assert cache.has_blob("abc")
+    assert cache.get_blob("abc") == b"%PDF-1.4"
+    assert cache.get_blob("missing") is None
+
+
+def test_prune_drops_expired_entries_and_unreferenced_blobs(cache):
+    old = time.time() - 40 * 86400
+    for sha256 in ("kept", "stale", "live"):
+        cache.put_blob(sha256, b"%PDF-1.4")
+    for sha256 in ("kept", "stale"):
+        os.utime(cache.blob_dir / f"{sha256}.pdf", (old, old))
+
+    cache.set_summary("old", "expired")
+    cache.set_summary("new", "fresh")
+    cache.set_url_meta("https://example.com/old.pdf", None, None, "stale")
+    cache.set_url_meta("https://example.com/kept.pdf", None, None, "kept")
+    cache._conn.execute("UPDATE summary_cache SET created_at = created_at - INTERVAL 40 DAY WHERE cache_key = 'old'")
+    cache._conn.execute("UPDATE url_meta SET updated_at = updated_at - INTERVAL 40 DAY WHERE sha256 = 'stale'")
+
+    assert cache.prune(30) == 3
+    assert cache.get_summary("old") is None
+    assert cache.get_summary("new") == "fresh"
+    assert cache.get_url_meta("https://example.com/old.pdf") is None
+    # Old but still referenced, and unreferenced but recent, both stay
+    assert cache.has_blob("kept") and cache.has_blob("live")
+    assert not cache.has_blob("stale")
@@ -0,0 +1,36 @@
+"""Tests for company-name extraction from announcement titles"""
+
+import pytest
+
+from src.core.processor import RSSAwardsProcessor
+from src.data.company_names import extract_company_name
+from src.data.hash_database_manager import HashDatabaseManager
+
+
+@pytest.mark.parametrize("title, expected", [
+    ("Larsen & Toubro Limited - Bagging/Receiving of orders/contracts", "Larsen & Toubro Limited"),
+    ("KEC International Ltd - Award of Order", "KEC International Ltd"),
+    ("Foo Ltd and Bar Limited wins", "Foo Ltd"),
+    ("XYZ Pvt.Ltd has won", "XYZ Pvt.Ltd"),
+    ("  Acme   Infra   Limited has informed the Exchange  ", "Acme Infra Limited"),
+    ("Tata Power has informed the Exchange about an order", "Tata Power"),
+    ("BHEL - Award of contract", "BHEL"),
+    ("Some announcement without a name", "Some announcement without a name"),
+    ("", "Unknown Company"),
+])
+def test_extract_company_name(title, expected):
+    assert extract_company_name(title) == expected
+
+
+def test_processor_and_hash_db_agree(tmp_path):
+    titles = ["Foo Ltd and Bar Limited wins", "XYZ Pvt.Ltd has won", "Larsen & Toubro Limited - Bagging"]
+    processor = RSSAwardsProcessor.__new__(RSSAwardsProcessor)
+
+    hash_db = HashDatabaseManager(str(tmp_path / "hashes.db"))
+    try:
+        hash_db.mark_articles_processed([{'title': title, 'link': title} for title in titles])
+        stored = dict(hash_db._conn.execute("SELECT title, company_name FROM processed_hashes").fetchall())
+    finally:
+        hash_db.close()
+
+    assert stored == {title: processor.extract_company_name(title) for title in titles}
@@ -0,0 +1,60 @@
+"""Tests for article search filtering"""
+
+from datetime import datetime, timedelta
+
+import duckdb
+import pytest
+
+from src.data.database_manager import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = DatabaseManager(str(tmp_path / "articles.db"))
+    db.insert_articles([
+        {'title': f'Company {i} Limited - Bagging', 'summary': 'Order', 'link': f'https://example.com/{i}.pdf'}
+        for i in range(4)
+    ])
+    return db
+
+
+def age_article(db, link, hours):
+    with duckdb.connect(db.db_path) as conn:
+        conn.execute("UPDATE articles SET updated_at = ? WHERE link = ?", [datetime.now() - timedelta(hours=hours), link])
+
+
+def links(articles):
+    return sorted(article['link'] for article in articles)
+
+
+def test_since_keeps_recently_seen_articles(db):
+    age_article(db, 'https://example.com/0.pdf', hours=5)
+    age_article(db, 'https://example.com/1.pdf', hours=3)
+
+    recent = db.search_articles(since=datetime.now() - timedelta(hours=2))
+
+    assert links(recent) == ['https://example.com/2.pdf', 'https://example.com/3.pdf']
+
+
+def test_without_since_returns_everything(db):
+    age_article(db, 'https://example.com/0.pdf', hours=5)
+
+    assert len(db.search_articles()) == 4
+
+
+def test_refetch_brings_article_back_into_window(db):
+    age_article(db, 'https://example.com/0.pdf', hours=5)
+    since = datetime.now() - timedelta(hours=2)
+    assert 'https://example.com/0.pdf' not in links(db.search_articles(since=since))
+
+    # Seeing the article in the feed again bumps updated_at
+    assert db.insert_articles([
+        {'title': 'Company 0 Limited - Bagging', 'summary': 'Order', 'link': 'https://example.com/0.pdf'}
+    ]) == (0, 1)
+    assert 'https://example.com/0.pdf' in links(db.search_articles(since=since))
+
+
+def test_since_combines_with_keywords(db):
+    since = datetime.now() - timedelta(hours=2)
+
+    assert links(db.search_articles(keywords=['company 3'], since=since)) == ['https://example.com/3.pdf']
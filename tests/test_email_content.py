@@ -0,0 +1,69 @@
+"""Tests for HTML escaping in the alert email"""
+
+import logging
+
+import pytest
+
+from src.core.processor import RSSAwardsProcessor
+
+
+@pytest.fixture
+def processor():
+    # The email builder only needs a logger, so skip the feed/database/SMTP setup
+    processor = RSSAwardsProcessor.__new__(RSSAwardsProcessor)
+    processor.logger = logging.getLogger(__name__)
+    return processor
+
+
+HOSTILE = '<script>alert("x")</script> & Co'
+
+
+def test_feed_text_is_escaped(processor):
+    article = {
+        'title': f'Evil Limited - {HOSTILE}',
+        'summary': HOSTILE,
+        'published': '<b>today</b>',
+        'link': 'https://example.com/a.pdf?x="><script>',
+    }
+
+    _, body = processor.create_simple_email_content([article], {})
+
+    assert '<script>' not in body
+    assert '&lt;script&gt;alert(&quot;x&quot;)&lt;/script&gt; &amp; Co' in body
+    assert '&lt;b&gt;today&lt;/b&gt;' in body
+    assert 'href="https://example.com/a.pdf?x=&quot;&gt;&lt;script&gt;"' in body
+
+
+def test_financial_data_is_escaped(processor):
+    article = {'title': 'Acme <Infra> Limited - Bagging', 'summary': 'Order', 'link': 'https://example.com/b.pdf'}
+    financial_data = {
+        'Acme <Infra> Limited': {
+            'audited_data': {'fiscal_year': 'FY24<img>', 'revenue_crores': '1,000 & more',
+                             'orderbook_crores': '5', 'orderbook_revenue_ratio': '<5>'},
+        },
+    }
+
+    _, body = processor.create_simple_email_content([article], financial_data)
+
+    assert 'Acme &lt;Infra&gt; Limited' in body
+    assert 'FY24&lt;img&gt;' in body and '1,000 &amp; more' in body and '&lt;5&gt;' in body
+    assert '<img>' not in body and '<Infra>' not in body
+
+
+def test_lookup_error_is_escaped(processor):
+    article = {'title': 'Acme Limited - Bagging', 'summary': 'Order', 'link': 'https://example.com/c.pdf'}
+
+    _, body = processor.create_simple_email_content([article], {'Acme Limited': {'error': '<b>timeout</b>'}})
+
+    assert '&lt;b&gt;timeout&lt;/b&gt;' in body
+
+
+def test_prefetched_summary_is_inserted_as_is(processor):
+    # Prefetched summaries are already escaped and formatted by _format_summary
+    article = {'title': 'Acme Limited - Bagging', 'summary': 'RSS text', 'link': 'https://example.com/d.pdf'}
+    summaries = {article['link']: '<strong>Order:</strong> Rs. 10 Crores'}
+
+    _, body = processor.create_simple_email_content([article], {}, summaries=summaries)
+
+    assert '<strong>Order:</strong> Rs. 10 Crores' in body
+    assert 'RSS text' not in body
@@ -0,0 +1,86 @@
+"""Tests for concurrent financial data lookups"""
+
+import logging
+import threading
+import time
+
+import pytest
+
+from src.ai import gemini_client
+from src.core.processor import RSSAwardsProcessor
+
+
+class FakeFinancialTool:
+    """Records lookups and how many run at once"""
+
+    def __init__(self, delay: float = 0.05, failing=()):
+        self.delay = delay
+        self.failing = set(failing)
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def get_company_financial_data(self, company_name: str) -> dict:
+        with self._lock:
+            self.calls.append(company_name)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if company_name in self.failing:
+                return {"error": "no data"}
+            return {"company": company_name}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def make_processor(tool, max_financial_requests: int = 10) -> RSSAwardsProcessor:
+    # Lookups only need the tool, a logger and the request cap
+    processor = RSSAwardsProcessor.__new__(RSSAwardsProcessor)
+    processor.logger = logging.getLogger(__name__)
+    processor.financial_tool = tool
+    processor.max_financial_requests = max_financial_requests
+    return processor
+
+
+def article(company: str) -> dict:
+    return {'title': f'{company} Limited - Bagging of order', 'link': f'https://example.com/{company}.pdf'}
+
+
+def test_lookups_run_concurrently_in_article_order():
+    tool = FakeFinancialTool()
+    names = ['Alpha', 'Bravo', 'Charlie', 'Delta']
+
+    financial_data = make_processor(tool).get_financial_data([article(name) for name in names])
+
+    assert list(financial_data) == [f'{name} Limited' for name in names]
+    assert all(data == {"company": company} for company, data in financial_data.items())
+    assert tool.max_active > 1
+    assert tool.max_active <= gemini_client.MAX_CONCURRENT_GEMINI_CALLS
+
+
+def test_each_company_is_looked_up_once_up_to_the_cap():
+    tool = FakeFinancialTool(delay=0)
+    articles = [article(name) for name in ['Alpha', 'Bravo', 'Alpha', 'Charlie', 'Bravo', 'Delta']]
+
+    financial_data = make_processor(tool, max_financial_requests=3).get_financial_data(articles)
+
+    assert list(financial_data) == ['Alpha Limited', 'Bravo Limited', 'Charlie Limited']
+    assert sorted(tool.calls) == sorted(financial_data)
+
+
+def test_failed_lookup_is_retried_then_reported(monkeypatch):
+    monkeypatch.setattr(gemini_client.time, "sleep", lambda seconds: None)
+    tool = FakeFinancialTool(delay=0, failing={'Bravo Limited'})
+
+    financial_data = make_processor(tool).get_financial_data([article('Alpha'), article('Bravo')])
+
+    assert financial_data['Alpha Limited'] == {"company": "Alpha Limited"}
+    assert financial_data['Bravo Limited'] == {"error": "no data"}
+    assert tool.calls.count('Bravo Limited') == 2
+
+
+def test_no_tool_means_no_lookups():
+    assert make_processor(None).get_financial_data([article('Alpha')]) == {}
@@ -0,0 +1,120 @@
+"""Tests for the processed-article hash database"""
+
+import hashlib
+
+import duckdb
+import pytest
+
+from src.data.hash_database_manager import HashDatabaseManager
+
+
+def make_article(i: int) -> dict:
+    return {
+        'title': f'Company {i} Limited - Bagging of order',
+        'summary': f'Order number {i}',
+        'link': f'https://example.com/filing-{i}.pdf',
+    }
+
+
+@pytest.fixture
+def hash_db(tmp_path):
+    db = HashDatabaseManager(str(tmp_path / "hashes.db"))
+    yield db
+    db.close()
+
+
+def test_mark_and_filter_new_articles(hash_db):
+    articles = [make_article(i) for i in range(5)]
+
+    new_articles = hash_db.filter_new_articles(articles)
+    assert len(new_articles) == 5
+
+    assert hash_db.mark_articles_processed(new_articles[:3]) == 3
+    assert [a['link'] for a in hash_db.filter_new_articles(articles)] == [
+        articles[3]['link'], articles[4]['link']
+    ]
+
+
+def test_marking_twice_is_not_an_error(hash_db):
+    articles = [make_article(i) for i in range(2)]
+
+    assert hash_db.mark_articles_processed(articles) == 2
+    assert hash_db.mark_articles_processed(articles) == 2
+    assert hash_db.get_processing_stats()['total_processed'] == 2
+
+
+def test_migrates_legacy_md5_hashes(tmp_path):
+    db_path = str(tmp_path / "legacy.db")
+    old = make_article(1)
+    legacy_hash = hashlib.md5(f"{old['title']}|{old['summary']}|{old['link']}".encode('utf-8')).hexdigest()
+
+    # Schema and row as written before the BLAKE2b switch
+    with duckdb.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE processed_hashes (
+                content_hash TEXT PRIMARY KEY,
+                processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                title TEXT,
+                company_name TEXT,
+                article_link TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX idx_processed_hash ON processed_hashes(content_hash)")
+        conn.execute(
+            "INSERT INTO processed_hashes (content_hash, title, article_link) VALUES (?, ?, ?)",
+            [legacy_hash, old['title'], old['link']]
+        )
+
+    hash_db = HashDatabaseManager(db_path)
+    try:
+        column_type = hash_db._conn.execute("""
+            SELECT data_type FROM information_schema.columns
+            WHERE table_name = 'processed_hashes' AND column_name = 'content_hash'
+        """).fetchone()[0]
+        assert column_type == 'BLOB'
+
+        # Already alerted on before the switch, so it must not alert again
+        assert hash_db.is_article_processed(old)
+        new = make_article(2)
+        assert hash_db.filter_new_articles([old, new]) == [new]
+
+        # New marks use the 16-byte BLAKE2b digest
+        hash_db.mark_articles_processed([new])
+        assert hash_db.is_hash_processed(hashlib.blake2b(
+            f"{new['title']}|{new['summary']}|{new['link']}".encode('utf-8'), digest_size=16
+        ).digest())
+
+        # Once cleanup has aged out the migrated row, MD5 lookups stop for good
+        hash_db._conn.execute(
+            "UPDATE processed_hashes SET processed_at = processed_at - INTERVAL 40 DAY WHERE title = ?",
+            [old['title']]
+        )
+        assert hash_db.cleanup_old_hashes(days_to_keep=30) == 1
+        assert hash_db._legacy_until is None
+        assert not hash_db.is_article_processed(old)
+    finally:
+        hash_db.close()
+
+    reopened = HashDatabaseManager(db_path)
+    try:
+        assert reopened._legacy_until is None
+    finally:
+        reopened.close()
+
+
+def test_new_database_skips_legacy_lookups(hash_db):
+    assert hash_db._legacy_until is None
+
+
+def test_bulk_lookup_error_assumes_new(hash_db):
+    hash_db._read_conn.close()
+
+    assert hash_db.filter_new_articles_bulk([b'\x00' * 16]) == set()
+
+
+def test_cleanup_old_hashes(hash_db):
+    hash_db.mark_articles_processed([make_article(i) for i in range(3)])
+
+    assert hash_db.cleanup_old_hashes(days_to_keep=30) == 0
+    assert hash_db.cleanup_old_hashes(days_to_keep=-1) == 3
+    assert hash_db.get_processing_stats()['total_processed'] == 0
@@ -0,0 +1,101 @@
+"""Tests for the per-host rate limiter"""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from src.data import http_session
+from src.data.http_session import HostRateLimiter, parse_retry_after
+
+
+class FakeClock:
+    """Stands in for the time module: sleeping just advances the clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(http_session, "time", fake)
+    return fake
+
+
+URL = "https://nsearchives.nseindia.com/corporate/filing.pdf"
+
+
+def test_burst_up_to_rate_then_waits(clock):
+    limiter = HostRateLimiter(rate=2)
+
+    limiter.acquire(URL)
+    limiter.acquire(URL)
+    assert clock.slept == []
+
+    limiter.acquire(URL)
+    assert clock.slept == [pytest.approx(0.5)]
+
+
+def test_hosts_are_limited_independently(clock):
+    limiter = HostRateLimiter(rate=1)
+
+    limiter.acquire(URL)
+    limiter.acquire("https://www.bseindia.com/x.pdf")
+    assert clock.slept == []
+
+
+def test_penalize_halves_rate_and_recovers(clock):
+    limiter = HostRateLimiter(rate=4, penalty_seconds=60)
+
+    limiter.penalize(URL)
+    limiter.penalize(URL)
+    assert limiter.get_rate(URL) == 1
+
+    clock.now += 60
+    assert limiter.get_rate(URL) == 2
+    clock.now += 60
+    assert limiter.get_rate(URL) == 4
+    clock.now += 60
+    assert limiter.get_rate(URL) == 4
+
+
+def test_rate_never_drops_below_floor(clock):
+    limiter = HostRateLimiter(rate=0.2)
+
+    for _ in range(5):
+        limiter.penalize(URL)
+    assert limiter.get_rate(URL) == http_session.MIN_HOST_RATE
+
+
+def test_retry_after_blocks_host(clock):
+    limiter = HostRateLimiter(rate=100)
+
+    limiter.penalize(URL, retry_after=5)
+    limiter.acquire(URL)
+    assert sum(clock.slept) == pytest.approx(5)
+
+
+def test_retry_after_is_capped(clock):
+    limiter = HostRateLimiter(rate=100)
+
+    limiter.penalize(URL, retry_after=3600)
+    limiter.acquire(URL)
+    assert sum(clock.slept) == pytest.approx(http_session.MAX_RETRY_AFTER_SECONDS)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("7") == 7
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 0 < parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 30
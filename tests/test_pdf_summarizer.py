@@ -0,0 +1,128 @@
+"""Tests for batched Gemini summarization and its per-text fallback"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from src.ai import gemini_client, pdf_summarizer
+from src.data.cache_manager import CacheManager
+
+
+class FakeModels:
+    """Answers generate_content from a callable and records every prompt"""
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.prompts = []
+
+    def generate_content(self, model, contents, config):
+        prompt = contents if isinstance(contents, str) else "".join(contents)
+        self.prompts.append(prompt)
+        text = self.answer(prompt)
+        part = SimpleNamespace(text=text)
+        return SimpleNamespace(text=text, candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+
+
+@pytest.fixture
+def gemini(tmp_path, monkeypatch):
+    """Route the summarizer to a fake client and a throwaway cache"""
+    cache = CacheManager(str(tmp_path / "cache.db"), str(tmp_path / "blobs"))
+    monkeypatch.setattr(pdf_summarizer, "get_cache", lambda: cache)
+    monkeypatch.setattr(pdf_summarizer, "_summary_config", lambda max_output_tokens: None)
+    monkeypatch.setattr(pdf_summarizer, "_batch_config", lambda count, max_output_tokens: None)
+    monkeypatch.setattr(gemini_client.time, "sleep", lambda seconds: None)  # No real backoff waits
+
+    def install(answer):
+        models = FakeModels(answer)
+        monkeypatch.setattr(pdf_summarizer, "get_gemini_client", lambda: SimpleNamespace(models=models))
+        return models
+
+    yield install
+    cache.close()
+
+
+def is_batch(prompt: str) -> bool:
+    return "Return a JSON array" in prompt
+
+
+def test_batch_response_is_split_in_order(gemini):
+    models = gemini(lambda prompt: json.dumps(["first", " second ", "third"]))
+
+    summaries = pdf_summarizer.summarize_texts_with_gemini(["a", "b", "c"])
+
+    assert summaries == ["first", "second", "third"]
+    assert len(models.prompts) == 1
+
+
+def test_cached_summaries_skip_gemini(gemini):
+    gemini(lambda prompt: json.dumps(["one", "two"]))
+    pdf_summarizer.summarize_texts_with_gemini(["a", "b"])
+
+    models = gemini(lambda prompt: pytest.fail("cached texts must not be resent"))
+    assert pdf_summarizer.summarize_texts_with_gemini(["a", "b"]) == ["one", "two"]
+    assert models.prompts == []
+
+
+@pytest.mark.parametrize("batch_answer", [
+    "not json",
+    json.dumps(["only one"]),
+    json.dumps({"summaries": ["x", "y"]}),
+])
+def test_malformed_batch_falls_back_to_single_calls(gemini, batch_answer):
+    def answer(prompt):
+        if is_batch(prompt):
+            return batch_answer
+        return f"single {prompt.rsplit(chr(10), 1)[-1]}"
+
+    models = gemini(answer)
+
+    assert pdf_summarizer.summarize_texts_with_gemini(["doc-a", "doc-b"]) == ["single doc-a", "single doc-b"]
+    assert len(models.prompts) == 3
+
+
+def test_failed_single_call_only_loses_that_text(gemini):
+    def answer(prompt):
+        if is_batch(prompt) or prompt.endswith("bad"):
+            raise RuntimeError("quota exceeded")
+        return "fine"
+
+    gemini(answer)
+
+    assert pdf_summarizer.summarize_texts_with_gemini(["good", "bad", "also good"]) == ["fine", None, "fine"]
+
+
+def test_transient_single_call_error_is_retried(gemini):
+    failures = []
+
+    def answer(prompt):
+        if is_batch(prompt):
+            return "not json"
+        if not failures:
+            failures.append(prompt)
+            raise RuntimeError("503 service unavailable")
+        return "recovered"
+
+    models = gemini(answer)
+
+    assert pdf_summarizer.summarize_texts_with_gemini(["only", "other"]) == ["recovered", "recovered"]
+    assert len(models.prompts) == 4
+
+
+def test_bad_api_key_is_not_retried(gemini):
+    def answer(prompt):
+        raise RuntimeError("API key not valid")
+
+    models = gemini(answer)
+
+    assert pdf_summarizer.summarize_texts_with_gemini(["a"]) == [None]
+    assert len(models.prompts) == 1
+
+
+def test_caller_instructions_reach_the_prompt(gemini):
+    models = gemini(lambda prompt: json.dumps(["x", "y"]))
+
+    pdf_summarizer.summarize_texts_with_gemini(["a", "b"], instructions="List the order value.")
+
+    assert "List the order value." in models.prompts[0]
+    assert "[1]\na" in models.prompts[0] and "[2]\nb" in models.prompts[0]